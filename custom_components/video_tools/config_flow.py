@@ -10,10 +10,41 @@ from homeassistant import config_entries
 from homeassistant.core import HomeAssistant
 from homeassistant.data_entry_flow import FlowResult
 
-from .const import DOMAIN, DOWNLOADER_DOMAIN, CONF_DOWNLOAD_DIR, CONF_TIMEOUT, DEFAULT_TIMEOUT
+from .const import (
+    DOMAIN,
+    DOWNLOADER_DOMAIN,
+    CONF_DOWNLOAD_DIR,
+    CONF_HW_ACCEL,
+    CONF_MAX_PARALLEL,
+    CONF_TIMEOUT,
+    DEFAULT_HW_ACCEL,
+    DEFAULT_MAX_PARALLEL,
+    DEFAULT_TIMEOUT,
+    HW_ACCEL_OPTIONS,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
+# Validators composed once at import; only the outer vol.Schema wrapper
+# is rebuilt per form render because its default value varies
+_TIMEOUT_VALIDATOR = vol.All(vol.Coerce(int), vol.Range(min=1))
+_MAX_PARALLEL_VALIDATOR = vol.All(vol.Coerce(int), vol.Range(min=1, max=8))
+
+
+def _log_similar_domains(hass: HomeAssistant) -> None:
+    """Log loaded domains that look like the Downloader integration.
+
+    Diagnostic-only helper for the detection failure path; the linear
+    scan over hass.config.components runs solely when debug logging is
+    enabled.
+    """
+    if _LOGGER.isEnabledFor(logging.DEBUG):
+        _LOGGER.debug(
+            "Downloader integration is loaded but no download_dir found. "
+            "Available integrations: %s",
+            [domain for domain in hass.config.components if "download" in domain.casefold()],
+        )
+
 
 async def detect_downloader_integration(hass: HomeAssistant) -> dict[str, Any] | None:
     """Try to detect the Downloader integration configuration."""
@@ -23,45 +54,36 @@ async def detect_downloader_integration(hass: HomeAssistant) -> dict[str, Any] |
         return None
     
     _LOGGER.debug("Downloader integration found in components, attempting to retrieve configuration")
-    
-    # Try multiple methods to get the downloader configuration
-    download_dir = None
-    
-    # Method 1: Check hass.data[DOWNLOADER_DOMAIN] (YAML-based integration)
+
+    # Single prioritized lookup: classify the hass.data payload once
+    # (dict with download_dir, or a bare string in uncommon setups), and
+    # only fall back to the config-entry scan when that yields nothing
     downloader_config = hass.data.get(DOWNLOADER_DOMAIN)
-    if downloader_config:
-        _LOGGER.debug("Found downloader config in hass.data[%s] (type: %s)", DOWNLOADER_DOMAIN, type(downloader_config).__name__)
-        if isinstance(downloader_config, dict):
-            download_dir = downloader_config.get("download_dir")
-        else:
-            _LOGGER.debug("downloader_config is not a dict: %s", type(downloader_config))
+    if _LOGGER.isEnabledFor(logging.DEBUG):
+        # type(...).__name__ is only worth computing when debug is on
+        _LOGGER.debug(
+            "Downloader config in hass.data is of type: %s",
+            type(downloader_config).__name__,
+        )
+    if isinstance(downloader_config, dict):
+        download_dir = downloader_config.get("download_dir")
+    elif isinstance(downloader_config, str):
+        download_dir = downloader_config
     else:
-        _LOGGER.debug("No data found in hass.data[%s]", DOWNLOADER_DOMAIN)
-    
-    # Method 2: Check config entries for Downloader
+        download_dir = None
+
     if not download_dir:
-        _LOGGER.debug("Checking config entries for downloader integration")
-        for entry in hass.config_entries.async_entries(DOWNLOADER_DOMAIN):
-            _LOGGER.debug("Found downloader config entry with keys: %s", list(entry.data.keys()))
-            if "download_dir" in entry.data:
-                download_dir = entry.data["download_dir"]
-                break
-    
-    # Method 3: Check if data is stored under a different key structure
-    if not download_dir and downloader_config:
-        _LOGGER.debug("Attempting to extract download_dir from alternative data structures")
-        # Some integrations may store the download directory as a string value directly
-        # This is uncommon but we check for it as a fallback
-        if isinstance(downloader_config, str):
-            download_dir = downloader_config
+        download_dir = next(
+            (
+                entry.data["download_dir"]
+                for entry in hass.config_entries.async_entries(DOWNLOADER_DOMAIN)
+                if "download_dir" in entry.data
+            ),
+            None,
+        )
     
     if not download_dir:
-        if _LOGGER.isEnabledFor(logging.DEBUG):
-            _LOGGER.debug(
-                "Downloader integration is loaded but no download_dir found. "
-                "Available integrations: %s",
-                [domain for domain in hass.config.components if "download" in domain.lower()]
-            )
+        _log_similar_domains(hass)
         return None
     
     _LOGGER.info("Successfully retrieved download directory from Downloader")
@@ -72,20 +94,26 @@ class VideoToolsConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):  # type: i
     """Handle a config flow for Video Tools."""
 
     VERSION = 1
-    
+
     # Only allow a single config entry
     # This ensures only one instance of Video Tools can be configured
     # as the service and sensor are global to the integration
     SINGLE_CONFIG_ENTRY = True
 
+    def __init__(self) -> None:
+        """Initialize the config flow."""
+        # Cache the Downloader detection result so the configure step
+        # doesn't repeat the hass.data / config-entries scan
+        self._downloader_info: dict[str, Any] | None = None
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
         """Handle the initial step - verify Downloader is installed."""
         # Check if Downloader is installed (required dependency)
-        downloader_info = await detect_downloader_integration(self.hass)
-        
-        if downloader_info is None:
+        self._downloader_info = await detect_downloader_integration(self.hass)
+
+        if self._downloader_info is None:
             # Downloader is not installed - abort configuration
             _LOGGER.error("Downloader integration is required but not installed")
             return self.async_abort(
@@ -108,7 +136,9 @@ class VideoToolsConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):  # type: i
         if user_input is not None:
             download_dir = user_input.get(CONF_DOWNLOAD_DIR, "").strip()
             timeout = user_input.get(CONF_TIMEOUT, DEFAULT_TIMEOUT)
-            
+            max_parallel = user_input.get(CONF_MAX_PARALLEL, DEFAULT_MAX_PARALLEL)
+            hw_accel = user_input.get(CONF_HW_ACCEL, DEFAULT_HW_ACCEL)
+
             if not download_dir:
                 errors[CONF_DOWNLOAD_DIR] = "download_dir_required"
             else:
@@ -118,12 +148,16 @@ class VideoToolsConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):  # type: i
                     data={
                         CONF_DOWNLOAD_DIR: download_dir,
                         CONF_TIMEOUT: timeout,
+                        CONF_MAX_PARALLEL: max_parallel,
+                        CONF_HW_ACCEL: hw_accel,
                     },
                 )
 
-        # Get Downloader configuration to pre-fill the field
-        # We know Downloader is installed because async_step_user verified it
-        downloader_info = await detect_downloader_integration(self.hass)
+        # Pre-fill the field from the detection cached by async_step_user;
+        # only re-detect if this step is somehow entered directly
+        downloader_info = self._downloader_info
+        if downloader_info is None:
+            downloader_info = await detect_downloader_integration(self.hass)
         default_download_dir = ""
         if downloader_info:
             default_download_dir = downloader_info.get("download_dir", "")
@@ -134,9 +168,9 @@ class VideoToolsConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):  # type: i
             data_schema=vol.Schema(
                 {
                     vol.Required(CONF_DOWNLOAD_DIR, default=default_download_dir): str,
-                    vol.Optional(CONF_TIMEOUT, default=DEFAULT_TIMEOUT): vol.All(
-                        vol.Coerce(int), vol.Range(min=1)
-                    ),
+                    vol.Optional(CONF_TIMEOUT, default=DEFAULT_TIMEOUT): _TIMEOUT_VALIDATOR,
+                    vol.Optional(CONF_MAX_PARALLEL, default=DEFAULT_MAX_PARALLEL): _MAX_PARALLEL_VALIDATOR,
+                    vol.Optional(CONF_HW_ACCEL, default=DEFAULT_HW_ACCEL): vol.In(HW_ACCEL_OPTIONS),
                 }
             ),
             errors=errors,
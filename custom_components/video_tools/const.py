@@ -1,7 +1,23 @@
 """Constants for the Video Tools integration."""
+import sys
+from typing import Final
 
-DOMAIN = "video_tools"
-DOWNLOADER_DOMAIN = "downloader"
-CONF_DOWNLOAD_DIR = "download_dir"
-CONF_TIMEOUT = "timeout"
-DEFAULT_TIMEOUT = 300  # 5 minutes in seconds (optimized for Home Assistant Green specs)
+# String constants are interned so the dict-key lookups they feed
+# (hass.data, entry.data, call.data) can short-circuit on identity
+DOMAIN: Final = sys.intern("video_tools")
+DOWNLOADER_DOMAIN: Final = sys.intern("downloader")
+CONF_DOWNLOAD_DIR: Final = sys.intern("download_dir")
+CONF_TIMEOUT: Final = sys.intern("timeout")
+DEFAULT_TIMEOUT: Final[int] = 300  # 5 minutes in seconds (optimized for Home Assistant Green specs)
+CONF_MAX_PARALLEL: Final = sys.intern("max_parallel")
+DEFAULT_MAX_PARALLEL: Final[int] = 2  # Concurrent ffmpeg pipelines before calls queue up
+CONF_HW_ACCEL: Final = sys.intern("hw_accel")
+DEFAULT_HW_ACCEL: Final = "auto"
+# "auto" probes ffmpeg -encoders once; "none" forces libx264
+HW_ACCEL_OPTIONS: Final[list[str]] = [
+    "auto",
+    "none",
+    "h264_nvenc",
+    "h264_qsv",
+    "h264_vaapi",
+]
@@ -3,12 +3,14 @@ from __future__ import annotations
 
 from datetime import datetime
 import logging
+import time
 
 from homeassistant.components.sensor import SensorEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.device_registry import DeviceEntryType, DeviceInfo
+from homeassistant.helpers.event import async_call_later
 
 from .const import DOMAIN
 
@@ -18,6 +20,9 @@ _LOGGER = logging.getLogger(__name__)
 STATE_WORKING = "working"
 STATE_IDLE = "idle"
 
+# Delay before a batched attribute update is flushed to the state machine
+_FLUSH_DELAY = 0.1
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -49,6 +54,12 @@ class VideoNormalizerSensor(SensorEntity):
             "timestamp": None,
             "processes": [],
         }
+        # Pending debounced state flush, if any
+        self._flush_unsub: CALLBACK_TYPE | None = None
+        # (second, iso string) of the last formatted timestamp; state
+        # history doesn't need sub-second precision, so same-second
+        # updates reuse the string instead of re-formatting
+        self._ts_cache: tuple[int, str] = (0, "")
         
         # Add device info for proper organization in HA
         self._attr_device_info = DeviceInfo(
@@ -66,11 +77,36 @@ class VideoNormalizerSensor(SensorEntity):
             return "mdi:video-check"
         return "mdi:video-check-outline"
 
+    def _timestamp(self) -> str:
+        """Return the current ISO timestamp, cached per second."""
+        second = int(time.time())
+        if second != self._ts_cache[0]:
+            self._ts_cache = (second, datetime.fromtimestamp(second).isoformat())
+        return self._ts_cache[1]
+
+    @callback
+    def _async_cancel_flush(self) -> None:
+        """Cancel a pending debounced flush, if scheduled."""
+        if self._flush_unsub is not None:
+            self._flush_unsub()
+            self._flush_unsub = None
+
+    @callback
+    def _async_flush(self, _now: datetime) -> None:
+        """Write the batched attribute updates as a single state update."""
+        self._flush_unsub = None
+        self.async_write_ha_state()
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Drop any pending flush when the entity is removed."""
+        self._async_cancel_flush()
+
     @callback
     def set_working(self) -> None:
         """Set sensor to working state."""
+        self._async_cancel_flush()
         self._attr_native_value = STATE_WORKING
-        self._attr_extra_state_attributes["timestamp"] = datetime.now().isoformat()
+        self._attr_extra_state_attributes["timestamp"] = self._timestamp()
         self._attr_extra_state_attributes["processes"] = []
         self.async_write_ha_state()
         _LOGGER.info("Video Tools sensor state: working")
@@ -87,9 +123,10 @@ class VideoNormalizerSensor(SensorEntity):
             job_result: Result of the job (success, skipped, failed)
             processes: List of processes that were performed
         """
+        self._async_cancel_flush()
         self._attr_native_value = STATE_IDLE
         self._attr_extra_state_attributes["last_job"] = job_result
-        self._attr_extra_state_attributes["timestamp"] = datetime.now().isoformat()
+        self._attr_extra_state_attributes["timestamp"] = self._timestamp()
         self._attr_extra_state_attributes["processes"] = processes or []
         self.async_write_ha_state()
         _LOGGER.info(
@@ -107,5 +144,10 @@ class VideoNormalizerSensor(SensorEntity):
         processes = self._attr_extra_state_attributes["processes"]
         if isinstance(processes, list):
             processes.append(process_name)
-            self.async_write_ha_state()
+            # Batch rapid additions into one state write; the terminal
+            # set_idle/set_working updates still write immediately
+            if self._flush_unsub is None:
+                self._flush_unsub = async_call_later(
+                    self.hass, _FLUSH_DELAY, self._async_flush
+                )
             _LOGGER.debug("Added process to sensor: %s", process_name)
@@ -0,0 +1,364 @@
+"""Service handling for the Video Tools integration."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import time
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, ServiceCall, callback
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.service import SupportsResponse
+
+from .const import (
+    CONF_MAX_PARALLEL,
+    CONF_TIMEOUT,
+    DEFAULT_MAX_PARALLEL,
+    DEFAULT_TIMEOUT,
+    DOMAIN,
+)
+from .sensor import VideoNormalizerSensor
+from .video_processor import VideoProcessor
+
+_LOGGER = logging.getLogger(__name__)
+
+# Service constants
+SERVICE_NORMALIZE_VIDEO = "normalize_video"
+
+# Event fired on every terminal outcome; built once instead of
+# re-formatting the f-string on each service call
+EVENT_VIDEO_PROCESSING_FINISHED = f"{DOMAIN}_video_processing_finished"
+
+# Log level and message per processing outcome; the "failed" message
+# takes the error text as an extra argument
+_RESULT_LOGS = {
+    "skipped": (
+        logging.INFO,
+        "Video processing skipped (no changes needed): %s - "
+        "Elapsed time: %.2f seconds - Result: skipped",
+    ),
+    "success": (
+        logging.INFO,
+        "Video processed successfully: %s - "
+        "Elapsed time: %.2f seconds - Result: success",
+    ),
+    "failed": (
+        logging.ERROR,
+        "Video processing failed: %s - %s - "
+        "Elapsed time: %.2f seconds - Result: failed",
+    ),
+}
+
+
+@callback
+def _async_finish(
+    hass: HomeAssistant,
+    sensor: VideoNormalizerSensor | None,
+    result: str,
+    processes: list[str],
+    event_data: dict[str, Any],
+) -> None:
+    """Fire the finished event and return the sensor to idle.
+
+    Pure-sync @callback, so the wrap-up of every terminal branch runs
+    inline on the loop without task-creation overhead. The event is
+    fired before the sensor update so listeners observe the finished
+    event first.
+    """
+    hass.bus.async_fire(EVENT_VIDEO_PROCESSING_FINISHED, event_data)
+    if sensor:
+        sensor.set_idle(result, processes)
+
+
+def _aspect_ratio(value: Any) -> float:
+    """Validate a target aspect ratio in a single call.
+
+    Equivalent to vol.All(vol.Coerce(float), vol.Range(min=0.1, max=10.0))
+    without the nested validator hops on every service call.
+    """
+    try:
+        ratio = float(value)
+    except (TypeError, ValueError) as err:
+        raise vol.Invalid(f"Invalid aspect ratio: {value}") from err
+    if not 0.1 <= ratio <= 10.0:
+        raise vol.Invalid("Aspect ratio must be between 0.1 and 10.0")
+    return ratio
+
+
+def _positive_timeout(value: Any) -> int:
+    """Validate a timeout as a positive integer in a single call."""
+    try:
+        timeout = int(value)
+    except (TypeError, ValueError) as err:
+        raise vol.Invalid(f"Invalid timeout: {value}") from err
+    if timeout < 1:
+        raise vol.Invalid("Timeout must be at least 1 second")
+    return timeout
+
+
+# Service schema
+SERVICE_NORMALIZE_VIDEO_SCHEMA = vol.Schema(
+    {
+        vol.Required("input_file_path"): cv.string,
+        vol.Optional("output_file_path"): cv.string,
+        vol.Optional("overwrite", default=False): cv.boolean,
+        vol.Optional("normalize_aspect", default=True): cv.boolean,
+        vol.Optional("generate_thumbnail", default=True): cv.boolean,
+        vol.Optional("resize_width"): cv.positive_int,
+        vol.Optional("resize_height"): cv.positive_int,
+        vol.Optional("target_aspect_ratio"): _aspect_ratio,
+        vol.Optional("timeout"): _positive_timeout,
+    },
+    # Unknown keys are rejected up front (voluptuous' default, spelled
+    # out so the fast-path policy survives refactors)
+    extra=vol.PREVENT_EXTRA,
+)
+
+
+async def async_setup_services(
+    hass: HomeAssistant, entry: ConfigEntry, video_processor: VideoProcessor
+) -> None:
+    """Register the normalize_video service for a config entry."""
+    # Resolve the configured timeout once so service calls don't need to
+    # scan hass.data on every invocation
+    configured_timeout = entry.data.get(CONF_TIMEOUT, DEFAULT_TIMEOUT)
+
+    # The sensor platform registered itself while the platforms were
+    # being forwarded; bind the reference once rather than paying two
+    # dict lookups on every service call
+    sensor: VideoNormalizerSensor | None = hass.data[DOMAIN].get("sensor")
+
+    # Bound concurrent ffmpeg pipelines; bursts of service calls (e.g. a
+    # camera integration saving several clips at once) queue here instead
+    # of thrashing the CPU with parallel encodes
+    processing_sem = asyncio.Semaphore(
+        entry.data.get(CONF_MAX_PARALLEL, DEFAULT_MAX_PARALLEL)
+    )
+
+    async def handle_normalize_video(call: ServiceCall) -> dict[str, Any] | None:
+        """Handle the normalize_video service call.
+
+        Returns:
+            Service response data if call.return_response is True, otherwise None
+        """
+        # Normalize to a plain str once at the boundary; everything
+        # downstream (os.path helpers, ffmpeg argv) consumes it as-is
+        input_file_path = os.fspath(call.data["input_file_path"])
+
+        # Single response object shared by every terminal branch; stays
+        # None when the caller didn't ask for a response
+        response: dict[str, Any] | None = {} if call.return_response else None
+
+        # Track start time for performance logging (monotonic, immune to clock jumps)
+        start_time = time.perf_counter()
+
+        # Set sensor to working state
+        if sensor:
+            sensor.set_working()
+
+        # Validate video file exists before unpacking the remaining options,
+        # so the common "file moved/not yet flushed" race fails fast. The
+        # stat may hit slow/networked storage, so keep it off the event
+        # loop — and keep the result so the processor doesn't stat again.
+        try:
+            stat_result = await hass.async_add_executor_job(os.stat, input_file_path)
+        except OSError:
+            stat_result = None
+        if stat_result is None:
+            elapsed_time = time.perf_counter() - start_time
+            _LOGGER.error(
+                "Video file not found: %s - Elapsed time: %.2f seconds - Result: failed (file not found)",
+                input_file_path,
+                elapsed_time,
+            )
+            _async_finish(
+                hass,
+                sensor,
+                "failed",
+                [],
+                {
+                    "video_path": input_file_path,
+                    "result": "failed",
+                    "error": "Video file not found",
+                },
+            )
+            if response is not None:
+                response["success"] = False
+                response["error"] = "Video file not found"
+            return response
+
+        output_file_path = call.data.get("output_file_path")
+        overwrite = call.data.get("overwrite", False)
+        normalize_aspect = call.data.get("normalize_aspect", True)
+        generate_thumbnail = call.data.get("generate_thumbnail", True)
+        resize_width = call.data.get("resize_width")
+        resize_height = call.data.get("resize_height")
+        target_aspect_ratio = call.data.get("target_aspect_ratio")
+
+        # Get timeout from service call or use configured default
+        timeout = call.data.get("timeout", configured_timeout)
+
+        _LOGGER.info("Processing video: %s (timeout: %d seconds)", input_file_path, timeout)
+
+        # Parse output_file_path to extract output_path and output_name
+        # When overwrite is True, output_file_path is ignored and we use input path
+        if overwrite:
+            output_path = None
+            output_name = None
+        elif output_file_path:
+            # Split the full path into directory and filename
+            output_path, output_name = os.path.split(os.fspath(output_file_path))
+        else:
+            # No output specified and not overwriting
+            # This will cause the video processor to use the same directory/name as input
+            # which effectively creates a copy with the same name in the same location
+            output_path = None
+            output_name = None
+
+        # Process the video with timeout
+        try:
+            async with processing_sem, asyncio.timeout(timeout):
+                result = await video_processor.process_video(
+                    video_path=input_file_path,
+                    output_path=output_path,
+                    output_name=output_name,
+                    overwrite=overwrite,
+                    normalize_aspect=normalize_aspect,
+                    generate_thumbnail=generate_thumbnail,
+                    resize_width=resize_width,
+                    resize_height=resize_height,
+                    target_aspect_ratio=target_aspect_ratio,
+                    stat_result=stat_result,
+                )
+
+            # Collect processes performed; a set keeps them deduplicated
+            # and sorted() gives consumers a stable order
+            performed: set[str] = set()
+            performed.update(
+                operation
+                for operation, success in result.get("operations", {}).items()
+                if success
+            )
+            processes_performed = sorted(performed)
+
+            # Get temp files for cleanup after event firing and sensor update
+            temp_files = result.get("temp_files", [])
+
+            # Determine the outcome and finish via the shared dispatch path
+            if not result["success"]:
+                outcome = "failed"
+            elif result.get("skipped", False):
+                outcome = "skipped"
+            else:
+                outcome = "success"
+
+            level, message = _RESULT_LOGS[outcome]
+            if outcome == "failed":
+                _LOGGER.log(
+                    level,
+                    message,
+                    input_file_path,
+                    result.get("error", "Unknown error"),
+                    time.perf_counter() - start_time,
+                )
+            elif _LOGGER.isEnabledFor(logging.INFO):
+                # Elapsed time is only used for logging; skip the clock
+                # read entirely when INFO is filtered out
+                _LOGGER.log(level, message, input_file_path, time.perf_counter() - start_time)
+
+            # Ensure video_path is always in event data
+            event_data = dict(result)
+            event_data["video_path"] = input_file_path
+            event_data["result"] = outcome
+            _async_finish(hass, sensor, outcome, processes_performed, event_data)
+
+            # Clean up temporary files AFTER event firing and sensor state update
+            # Dispatched as a background task so the service response isn't
+            # delayed by unlink latency (noticeable on networked filesystems)
+            if temp_files:
+                hass.async_create_background_task(
+                    video_processor.cleanup_temp_files(temp_files),
+                    name="video_tools_cleanup",
+                )
+
+            # Return response data if requested
+            if response is not None:
+                response["success"] = result["success"]
+                response["skipped"] = result.get("skipped", False)
+                response["output_path"] = result.get("output_path")
+                response["operations"] = result.get("operations", {})
+            return response
+        except asyncio.TimeoutError:
+            elapsed_time = time.perf_counter() - start_time
+            _LOGGER.error(
+                "Video processing timed out after %d seconds: %s - "
+                "Elapsed time: %.2f seconds - Result: failed (timeout)",
+                timeout,
+                input_file_path,
+                elapsed_time,
+            )
+            _async_finish(
+                hass,
+                sensor,
+                "failed",
+                [],
+                {
+                    "video_path": input_file_path,
+                    "result": "failed",
+                    "error": f"Processing timed out after {timeout} seconds",
+                },
+            )
+            # Clean up any temp files that may have been created before timeout
+            # This happens AFTER event firing and sensor state update
+            hass.async_create_background_task(
+                video_processor.cleanup_temp_files_by_video_path(input_file_path),
+                name="video_tools_cleanup",
+            )
+            if response is not None:
+                response["success"] = False
+                response["error"] = f"Processing timed out after {timeout} seconds"
+            return response
+        except Exception as err:
+            elapsed_time = time.perf_counter() - start_time
+            _LOGGER.exception(
+                "Unexpected error processing video: %s - "
+                "Elapsed time: %.2f seconds - Result: failed (exception)",
+                input_file_path,
+                elapsed_time,
+            )
+            _async_finish(
+                hass,
+                sensor,
+                "failed",
+                [],
+                {
+                    "video_path": input_file_path,
+                    "result": "failed",
+                    "error": str(err),
+                },
+            )
+            # Clean up any temp files that may have been created before exception
+            # This happens AFTER event firing and sensor state update
+            hass.async_create_background_task(
+                video_processor.cleanup_temp_files_by_video_path(input_file_path),
+                name="video_tools_cleanup",
+            )
+            if response is not None:
+                response["success"] = False
+                response["error"] = str(err)
+            return response
+
+    # Register the service
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_NORMALIZE_VIDEO,
+        handle_normalize_video,
+        schema=SERVICE_NORMALIZE_VIDEO_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    _LOGGER.info("Video Tools service registered successfully")
@@ -6,12 +6,137 @@ import functools
 import json
 import logging
 import os
-import re
 import shutil
+import signal
+import sqlite3
+import tempfile
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
 from typing import Any
 
+try:
+    # Home Assistant ships orjson; it parses ffprobe's stdout bytes
+    # directly, skipping the .decode() and the slower stdlib parser
+    from orjson import loads as _json_loads
+except ImportError:  # pragma: no cover
+    # Only bytes input is ever passed, where the signatures agree
+    _json_loads = json.loads  # type: ignore[assignment]
+
+try:
+    # Optional: reading the container header in-process is an order of
+    # magnitude cheaper than spawning ffprobe
+    import av as _av
+except ImportError:
+    _av = None
+
 _LOGGER = logging.getLogger(__name__)
 
+# Maximum number of probe results kept in the per-processor LRU cache
+_PROBE_CACHE_MAX = 128
+
+# Resolutions that are exactly 16:9, letting the default normalize
+# request short-circuit without any aspect-ratio math
+_COMMON_16_9_RESOLUTIONS = frozenset(
+    {(640, 360), (1024, 576), (1280, 720), (1600, 900),
+     (1920, 1080), (2560, 1440), (3840, 2160), (7680, 4320)}
+)
+
+# Binary names resolved to absolute paths, shared across instances so
+# each processor doesn't redo the PATH scan
+_BINARY_PATHS: dict[str, str] = {}
+
+
+@dataclass(slots=True, frozen=True)
+class VideoInfo:
+    """Probed stream information for a video file.
+
+    Frozen with slots: instances are immutable, so the probe cache can
+    hand the same object to every caller without defensive copies, and
+    attribute access replaces dict lookups on the hot paths.
+    """
+
+    width: int
+    height: int
+    aspect_ratio: float
+    codec: str | None = None
+    duration: float | None = None
+    # None means the probe didn't look (pyav header read); the combined
+    # ffprobe run always records a real bool
+    has_thumbnail: bool | None = None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the dimension fields in the result/event dict shape."""
+        return {
+            "width": self.width,
+            "height": self.height,
+            "aspect_ratio": self.aspect_ratio,
+        }
+
+
+def _fast_copy(src: str, dst: str) -> None:
+    """Copy a file using the kernel's in-kernel copy path when available.
+
+    os.copy_file_range lets the kernel move the bytes without a
+    userspace bounce buffer, and on reflink-capable filesystems
+    (btrfs/XFS) it degenerates to a metadata-only clone. Falls back to
+    shutil.copy2 when the syscall is missing or refuses the file pair.
+
+    Args:
+        src: Source file path
+        dst: Destination file path
+    """
+    if hasattr(os, "copy_file_range"):
+        try:
+            with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+                remaining = os.fstat(fsrc.fileno()).st_size
+                while remaining > 0:
+                    copied = os.copy_file_range(
+                        fsrc.fileno(), fdst.fileno(), remaining
+                    )
+                    if copied == 0:
+                        raise OSError("copy_file_range made no progress")
+                    remaining -= copied
+            shutil.copystat(src, dst)
+            return
+        except OSError as err:
+            _LOGGER.debug("copy_file_range failed (%s), using shutil", err)
+    shutil.copy2(src, dst)
+
+
+def _passthrough(src: str, dst: str) -> None:
+    """Materialize dst as an unmodified copy of src as cheaply as possible.
+
+    A hardlink shares the bytes outright when both paths sit on the
+    same filesystem and the target doesn't exist; otherwise fall back
+    to _fast_copy, which itself degenerates to a reflink clone where
+    the filesystem supports it.
+
+    Args:
+        src: Source file path
+        dst: Destination file path
+    """
+    try:
+        os.link(src, dst)
+    except OSError:
+        _fast_copy(src, dst)
+
+
+def _resolve_binary(name: str) -> str:
+    """Resolve a binary name to an absolute path once.
+
+    Args:
+        name: Binary name or path as configured
+
+    Returns:
+        The absolute path if found on PATH, else the name unchanged
+    """
+    path = _BINARY_PATHS.get(name)
+    if path is None:
+        path = shutil.which(name) or name
+        _BINARY_PATHS[name] = path
+    return path
+
 
 class VideoProcessor:
     """Handle video normalization operations."""
@@ -19,15 +144,290 @@ class VideoProcessor:
     # Tolerance for aspect ratio comparison
     ASPECT_RATIO_TOLERANCE = 0.01
 
-    def __init__(self, ffmpeg_path: str = "ffmpeg", ffprobe_path: str = "ffprobe"):
+    # Aspect ratio used when the caller doesn't specify one (16:9)
+    DEFAULT_ASPECT_RATIO = 16 / 9
+
+    def __init__(
+        self,
+        ffmpeg_path: str = "ffmpeg",
+        ffprobe_path: str = "ffprobe",
+        default_output_dir: str | None = None,
+        hw_accel: str = "auto",
+        encoder_preset: str = "veryfast",
+        encoder_crf: int = 23,
+        encoder_tune: str | None = None,
+        persistent_cache_path: str | None = None,
+    ):
         """Initialize the video processor.
-        
+
         Args:
             ffmpeg_path: Path to ffmpeg binary
             ffprobe_path: Path to ffprobe binary
+            default_output_dir: Configured download directory; kept as a
+                plain attribute so callers don't have to fetch it from
+                hass.data per call
+            hw_accel: Hardware encoder policy — "auto" probes the ffmpeg
+                build once, "none" forces libx264, or an explicit
+                encoder name (h264_nvenc/h264_qsv/h264_vaapi)
+            encoder_preset: libx264 preset; veryfast encodes severalfold
+                faster than medium at the same CRF, and the size delta
+                is irrelevant for preview-oriented output
+            encoder_crf: Constant quality target for the encode
+            encoder_tune: Optional libx264 -tune value (e.g.
+                "fastdecode" to lighten playback on low-power clients)
+            persistent_cache_path: Optional sqlite file backing the
+                probe cache across restarts; library-wide re-scans then
+                cost a lookup per unchanged file instead of an ffprobe
+        """
+        # Resolve the binaries up front; execvp would otherwise rescan
+        # PATH on every subprocess spawn
+        self.ffmpeg_path = _resolve_binary(ffmpeg_path)
+        self.ffprobe_path = _resolve_binary(ffprobe_path)
+        self.default_output_dir = default_output_dir
+        self.hw_accel = hw_accel
+        self.encoder_preset = encoder_preset
+        self.encoder_crf = encoder_crf
+        self.encoder_tune = encoder_tune
+        # Probe results keyed on (path, mtime_ns, size); any rewrite of
+        # the file changes the key, so stale entries simply age out of
+        # the LRU instead of needing explicit invalidation
+        self._probe_cache: OrderedDict[tuple[str, int, int], VideoInfo] = OrderedDict()
+        # On-disk sidecar for the probe cache; opened lazily off-loop
+        self.persistent_cache_path = persistent_cache_path
+        self._persist_conn: sqlite3.Connection | None = None
+        self._persist_lock = threading.Lock()
+        # Scratch directory per in-flight video, so the failure paths can
+        # find and remove intermediates without guessing filenames
+        self._scratch_dirs: dict[str, str] = {}
+        # Bound simultaneous ffmpeg output runs; each encoder spreads
+        # over cores with its own threads, so capping at half the CPUs
+        # keeps fan-out from degenerating into a context-switch storm.
+        # Probes stay outside the semaphore — they are I/O-light.
+        self._encode_sem = asyncio.Semaphore(max(1, (os.cpu_count() or 2) // 2))
+
+    @property
+    def hw_accel(self) -> str:
+        """Return the configured hardware encoder policy."""
+        return self._hw_accel
+
+    @hw_accel.setter
+    def hw_accel(self, value: str) -> None:
+        """Set the policy, invalidating the cached detection on change."""
+        if value != getattr(self, "_hw_accel", None):
+            self._hw_accel = value
+            self._hwenc: str | None = None
+            self._hwenc_checked = False
+
+    async def _detect_hw_encoder(self) -> str | None:
+        """Resolve the H.264 encoder offload to use, once per processor.
+
+        With the "auto" policy this lists the encoders compiled into the
+        local ffmpeg build a single time, then proves each hardware
+        H.264 candidate with a one-frame test encode before picking it;
+        the result (including "nothing found") is memoized so encode
+        calls never pay for the probe again.
+
+        Returns:
+            The hardware encoder name, or None to use libx264
+        """
+        if self._hwenc_checked:
+            return self._hwenc
+        self._hwenc_checked = True
+
+        if self._hw_accel == "none":
+            return None
+        if self._hw_accel != "auto":
+            self._hwenc = self._hw_accel
+            return self._hwenc
+
+        try:
+            process = await self._spawn([self.ffmpeg_path, "-hide_banner", "-encoders"])
+            stdout, _ = await self._reap(process)
+            if process.returncode == 0:
+                listed = stdout.decode(errors="replace")
+                for candidate in ("h264_nvenc", "h264_qsv", "h264_vaapi"):
+                    if candidate in listed and await self._validate_hw_encoder(
+                        candidate
+                    ):
+                        self._hwenc = candidate
+                        break
+        except Exception as err:
+            _LOGGER.debug("Hardware encoder detection failed: %s", err)
+
+        if self._hwenc:
+            _LOGGER.info("Using hardware H.264 encoder: %s", self._hwenc)
+        else:
+            _LOGGER.debug("No hardware H.264 encoder available, using libx264")
+        return self._hwenc
+
+    async def _validate_hw_encoder(self, candidate: str) -> bool:
+        """Prove a listed hardware encoder actually works on this host.
+
+        Distro ffmpeg builds list h264_nvenc/h264_qsv/h264_vaapi whether
+        or not the matching hardware and driver stack exist, so merely
+        appearing in -encoders is not enough to trust one. A one-frame
+        encode of a synthetic source exercises the driver end to end; a
+        failing candidate is rejected here, during detection, instead of
+        failing every real encode at run time.
+
+        Args:
+            candidate: Hardware encoder name to test
+
+        Returns:
+            True if the test encode succeeded
         """
-        self.ffmpeg_path = ffmpeg_path
-        self.ffprobe_path = ffprobe_path
+        cmd = [self.ffmpeg_path, "-hide_banner", "-v", "error"]
+        if candidate == "h264_vaapi":
+            cmd += ["-vaapi_device", "/dev/dri/renderD128"]
+        cmd += ["-f", "lavfi", "-i", "nullsrc=s=64x64", "-frames:v", "1"]
+        if candidate == "h264_vaapi":
+            # Mirror the real pipeline: software frames are uploaded to
+            # the render node just for the encode
+            cmd += ["-vf", "format=nv12,hwupload"]
+        cmd += ["-c:v", candidate, "-f", "null", "-"]
+
+        try:
+            process = await self._spawn(cmd)
+            await self._reap(process)
+        except OSError as err:
+            _LOGGER.debug(
+                "Hardware encoder %s validation did not run: %s", candidate, err
+            )
+            return False
+        if process.returncode != 0:
+            _LOGGER.debug(
+                "Hardware encoder %s failed the test encode, skipping", candidate
+            )
+            return False
+        return True
+
+    @staticmethod
+    def _target_dims(
+        cur_w: int, cur_h: int, tgt_w: int | None, tgt_h: int | None
+    ) -> tuple[int, int]:
+        """Compute resize target dimensions with integer-exact rounding.
+
+        The free axis is derived as (a * b + c // 2) // c — pure integer
+        arithmetic with round-half-up — instead of int(x / float_ratio),
+        whose truncation can land one pixel off and spuriously flag an
+        already-correct file as needing a re-encode.
+
+        Args:
+            cur_w: Current video width
+            cur_h: Current video height
+            tgt_w: Requested width, or None to derive from the height
+            tgt_h: Requested height, or None to derive from the width
+
+        Returns:
+            Tuple of (target width, target height)
+        """
+        if tgt_w and tgt_h:
+            return tgt_w, tgt_h
+        if tgt_w:
+            return tgt_w, (tgt_w * cur_h + cur_w // 2) // cur_w
+        if tgt_h:
+            return (tgt_h * cur_w + cur_h // 2) // cur_h, tgt_h
+        return cur_w, cur_h
+
+    def _video_encoder_args(self, hwenc: str | None, spec: str = "v") -> list[str]:
+        """Build the encoder argv for the given video stream specifier.
+
+        Args:
+            hwenc: Hardware encoder name, or None for libx264
+            spec: ffmpeg stream specifier the codec option applies to
+
+        Returns:
+            Encoder and quality arguments for the ffmpeg command line
+        """
+        quality = str(self.encoder_crf)
+        if hwenc == "h264_nvenc":
+            return [f"-c:{spec}", "h264_nvenc", "-preset", "p4", "-cq", quality]
+        if hwenc == "h264_qsv":
+            return [f"-c:{spec}", "h264_qsv", "-global_quality", quality]
+        if hwenc == "h264_vaapi":
+            return [f"-c:{spec}", "h264_vaapi", "-qp", quality]
+        args = [
+            f"-c:{spec}", "libx264",
+            "-preset", self.encoder_preset,
+            "-crf", quality,
+        ]
+        if self.encoder_tune:
+            args += ["-tune", self.encoder_tune]
+        return args
+
+    async def _spawn(
+        self,
+        cmd: list[str],
+        stdin: int = asyncio.subprocess.DEVNULL,
+        stdout: int = asyncio.subprocess.PIPE,
+        stderr: int = asyncio.subprocess.PIPE,
+    ) -> asyncio.subprocess.Process:
+        """Launch an ffmpeg/ffprobe subprocess with uniform settings.
+
+        Single choke point for process creation: stdin is wired to
+        /dev/null so ffmpeg can never stall waiting for console input,
+        and inherited descriptors are closed in the child. Keeping the
+        kwargs uniform here also keeps CPython on its cheap spawn path
+        (posix_spawn/vfork), avoiding a fork of the full HA process.
+
+        Args:
+            cmd: Command argv to execute
+            stdin: Disposition of the child's stdin; /dev/null unless
+                the caller feeds data through a pipe
+            stdout: Disposition of the child's stdout; encode calls that
+                write to a file pass DEVNULL since nothing is read back
+            stderr: Disposition of the child's stderr; probe-style calls
+                pass DEVNULL so no reader transport is set up for it
+
+        Returns:
+            The started subprocess
+        """
+        return await asyncio.create_subprocess_exec(
+            *cmd,
+            stdin=stdin,
+            stdout=stdout,
+            stderr=stderr,
+            close_fds=True,
+            # Own process group, so cancellation can take down ffmpeg
+            # and anything it forked in one killpg
+            start_new_session=True,
+        )
+
+    @staticmethod
+    def _kill_process_group(process: asyncio.subprocess.Process) -> None:
+        """Terminate a child's whole process group.
+
+        Races with the child exiting on its own are expected and
+        harmless, so lookup failures are swallowed.
+
+        Args:
+            process: The child whose group should be terminated
+        """
+        try:
+            os.killpg(os.getpgid(process.pid), signal.SIGTERM)
+        except (ProcessLookupError, PermissionError, OSError):
+            pass
+
+    async def _reap(
+        self, process: asyncio.subprocess.Process
+    ) -> tuple[bytes, bytes]:
+        """Collect a child's output, killing its group on cancellation.
+
+        Without this, cancelling a processing task (service timeout,
+        user abort) orphans the running ffmpeg, which keeps burning CPU
+        and disk for the rest of the encode.
+
+        Args:
+            process: The child to await
+
+        Returns:
+            The (stdout, stderr) pair from communicate()
+        """
+        try:
+            return await process.communicate()
+        except asyncio.CancelledError:
+            self._kill_process_group(process)
+            raise
 
     async def cleanup_temp_files(self, temp_files: list[str]) -> None:
         """Clean up temporary files after processing is complete.
@@ -42,16 +442,42 @@ class VideoProcessor:
             return
             
         _LOGGER.debug("Cleaning up %d temporary file(s)", len(temp_files))
-        
+
         loop = asyncio.get_running_loop()
-        for temp_file in temp_files:
+
+        async def remove_one(temp_file: str) -> None:
             try:
-                if await loop.run_in_executor(None, os.path.exists, temp_file):
-                    await loop.run_in_executor(None, os.remove, temp_file)
-                    _LOGGER.debug("Removed temporary file: %s", temp_file)
+                if await loop.run_in_executor(None, os.path.isdir, temp_file):
+                    # Scratch directory holding all intermediates
+                    await loop.run_in_executor(
+                        None,
+                        functools.partial(shutil.rmtree, temp_file, ignore_errors=True),
+                    )
+                    self._forget_scratch_dir(temp_file)
+                    _LOGGER.debug("Removed scratch directory: %s", temp_file)
+                else:
+                    try:
+                        await loop.run_in_executor(None, os.remove, temp_file)
+                        _LOGGER.debug("Removed temporary file: %s", temp_file)
+                    except FileNotFoundError:
+                        pass
             except Exception as err:
                 _LOGGER.debug("Could not remove temp file %s: %s", temp_file, err)
 
+        # Removals run overlapped, so total latency is bounded by the
+        # slowest entry — noticeable when media sits on NAS/SMB shares
+        await asyncio.gather(*(remove_one(temp_file) for temp_file in temp_files))
+
+    def _forget_scratch_dir(self, scratch_dir: str) -> None:
+        """Drop bookkeeping entries pointing at a removed scratch dir.
+
+        Args:
+            scratch_dir: Scratch directory path that no longer exists
+        """
+        for video_path, path in list(self._scratch_dirs.items()):
+            if path == scratch_dir:
+                del self._scratch_dirs[video_path]
+
     async def cleanup_temp_files_by_video_path(self, video_path: str) -> None:
         """Clean up temporary files based on the original video path.
         
@@ -61,62 +487,115 @@ class VideoProcessor:
         Args:
             video_path: Original video file path
         """
-        base_path, ext = os.path.splitext(video_path)
-        video_dir = os.path.dirname(video_path)
-        video_name = os.path.splitext(os.path.basename(video_path))[0]
-        
-        # List of possible temp files that could be created
-        possible_temp_files = [
-            f"{base_path}.resize.tmp{ext}",
-            f"{base_path}.normalize.tmp{ext}",
-            f"{base_path}.thumbnail.tmp{ext}",
-            os.path.join(video_dir, f"{video_name}_thumb.jpg"),
-        ]
-        
-        _LOGGER.debug("Attempting cleanup of potential temp files for: %s", video_path)
-        
+        scratch_dir = self._scratch_dirs.pop(video_path, None)
+        if scratch_dir is None:
+            return
+
+        _LOGGER.debug("Removing scratch directory for: %s", video_path)
+
         loop = asyncio.get_running_loop()
-        for temp_file in possible_temp_files:
-            try:
-                if await loop.run_in_executor(None, os.path.exists, temp_file):
-                    await loop.run_in_executor(None, os.remove, temp_file)
-                    _LOGGER.debug("Removed temporary file: %s", temp_file)
-            except Exception as err:
-                _LOGGER.debug("Could not remove temp file %s: %s", temp_file, err)
+        await loop.run_in_executor(
+            None, functools.partial(shutil.rmtree, scratch_dir, ignore_errors=True)
+        )
+
+    async def get_video_dimensions(
+        self, video_path: str, stat_result: os.stat_result | None = None
+    ) -> VideoInfo:
+        """Get video dimensions using ffprobe, with a minimal-probe retry.
+
+        Results are cached per (path, mtime, size), so re-probing an
+        unchanged file — e.g. analyze right after the initial probe —
+        costs a stat instead of an ffprobe subprocess.
 
-    async def get_video_dimensions(self, video_path: str) -> dict[str, Any]:
-        """Get video dimensions using ffprobe with ffmpeg fallback.
-        
         Args:
             video_path: Path to the video file
-            
+            stat_result: Optional os.stat result for the file; avoids a
+                second stat when the caller already has one
+
         Returns:
-            Dictionary with video information including width, height, and aspect ratio
+            VideoInfo with width, height, and aspect ratio
         """
+        cache_key: tuple[str, int, int] | None = None
+        try:
+            if stat_result is None:
+                loop = asyncio.get_running_loop()
+                stat_result = await loop.run_in_executor(None, os.stat, video_path)
+            cache_key = (video_path, stat_result.st_mtime_ns, stat_result.st_size)
+        except FileNotFoundError:
+            # Authoritative: no point spawning probes at a missing file
+            raise
+        except OSError:
+            # Permission or I/O oddities — let the probe produce the error
+            cache_key = None
+
+        if cache_key is not None:
+            cached = self._probe_cache.get(cache_key)
+            if cached is not None:
+                self._probe_cache.move_to_end(cache_key)
+                _LOGGER.debug("Using cached dimensions for: %s", video_path)
+                # Frozen, so the cached instance is safe to share
+                return cached
+
+            # Sidecar cache: still-fresh rows survive restarts, so a
+            # library re-scan costs a lookup instead of an ffprobe
+            if self.persistent_cache_path is not None:
+                loop = asyncio.get_running_loop()
+                persisted = await loop.run_in_executor(
+                    None, self._persist_lookup, cache_key
+                )
+                if persisted is not None:
+                    _LOGGER.debug(
+                        "Using persisted dimensions for: %s", video_path
+                    )
+                    self._cache_probe_result(cache_key, persisted, persist=False)
+                    return persisted
+
         _LOGGER.info("Detecting video dimensions for: %s", video_path)
 
-        # Try ffprobe first (JSON output)
+        # Try pyav first when installed: the dimensions live in the
+        # container header, no subprocess needed
+        if _av is not None:
+            try:
+                loop = asyncio.get_running_loop()
+                result = await loop.run_in_executor(
+                    None, self._get_dimensions_with_pyav, video_path
+                )
+                if result:
+                    _LOGGER.debug(
+                        "Video dimensions detected via pyav: %dx%d",
+                        result.width, result.height,
+                    )
+                    self._cache_probe_result(cache_key, result)
+                    return result
+            except Exception as err:
+                _LOGGER.debug("pyav probe failed, trying ffprobe: %s", err)
+
+        # Full ffprobe run: dimensions and thumbnail disposition come
+        # from the same subprocess and are cached together
         try:
-            result = await self._get_dimensions_with_ffprobe(video_path)
+            result = await self._probe_all(video_path, cache_key)
             if result:
                 _LOGGER.info(
                     "Video dimensions detected: %dx%d (aspect ratio: %.3f)",
-                    result["width"], result["height"], result["aspect_ratio"]
+                    result.width, result.height, result.aspect_ratio
                 )
                 return result
         except Exception as err:
             _LOGGER.debug(
-                "ffprobe failed, trying ffmpeg fallback: %s", err
+                "ffprobe failed, trying minimal probe fallback: %s", err
             )
 
-        # Fallback to ffmpeg -i
+        # Last resort: a second, minimal ffprobe asking only for WxH in
+        # csv form. No JSON to parse and no regex scraping of ffmpeg -i
+        # stderr, so it stays cheap and stable across ffmpeg releases.
         try:
-            result = await self._get_dimensions_with_ffmpeg(video_path)
+            result = await self._get_dimensions_minimal(video_path)
             if result:
                 _LOGGER.info(
-                    "Video dimensions detected (via ffmpeg): %dx%d (aspect ratio: %.3f)",
-                    result["width"], result["height"], result["aspect_ratio"]
+                    "Video dimensions detected (minimal probe): %dx%d (aspect ratio: %.3f)",
+                    result.width, result.height, result.aspect_ratio
                 )
+                self._cache_probe_result(cache_key, result)
                 return result
         except Exception as err:
             _LOGGER.error(
@@ -126,159 +605,386 @@ class VideoProcessor:
 
         raise ValueError(f"Could not determine dimensions for {video_path}")
 
-    async def _get_dimensions_with_ffprobe(
-        self, video_path: str
-    ) -> dict[str, Any] | None:
-        """Get video dimensions using ffprobe JSON output.
-        
+    def _get_dimensions_with_pyav(self, video_path: str) -> VideoInfo | None:
+        """Read dimensions from the container header via pyav.
+
+        Blocking — must run in an executor.
+
         Args:
             video_path: Path to the video file
-            
+
         Returns:
-            Dictionary with video information or None if failed
+            VideoInfo (without thumbnail knowledge) or None if failed
         """
-        cmd = [
-            self.ffprobe_path,
-            "-v", "quiet",
-            "-print_format", "json",
-            "-show_streams",
-            "-select_streams", "v:0",
-            video_path,
-        ]
-
+        container = _av.open(video_path)
         try:
-            process = await asyncio.create_subprocess_exec(
-                *cmd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
+            if not container.streams.video:
+                return None
+            stream = container.streams.video[0]
+            codec_context = stream.codec_context
+            width = codec_context.width
+            height = codec_context.height
+            if not width or not height:
+                return None
+            duration = (
+                float(stream.duration * stream.time_base)
+                if stream.duration
+                else None
             )
-            stdout, stderr = await process.communicate()
+            return VideoInfo(
+                width=width,
+                height=height,
+                aspect_ratio=width / height,
+                codec=codec_context.name,
+                duration=duration,
+            )
+        finally:
+            container.close()
 
-            if process.returncode != 0:
-                _LOGGER.debug(
-                    "ffprobe returned non-zero exit code: %s", stderr.decode()
+    def _open_persistent_cache(self) -> sqlite3.Connection | None:
+        """Open the sidecar probe cache on first use.
+
+        Blocking — must run in an executor.
+
+        Returns:
+            The connection, or None when no cache path is configured
+        """
+        if self.persistent_cache_path is None:
+            return None
+        with self._persist_lock:
+            if self._persist_conn is None:
+                conn = sqlite3.connect(
+                    self.persistent_cache_path, check_same_thread=False
                 )
-                return None
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS probe_cache ("
+                    "path TEXT PRIMARY KEY, mtime_ns INTEGER, size INTEGER, "
+                    "width INTEGER, height INTEGER, aspect_ratio REAL, "
+                    "codec TEXT, duration REAL, has_thumbnail INTEGER)"
+                )
+                conn.commit()
+                self._persist_conn = conn
+        return self._persist_conn
 
-            data = json.loads(stdout.decode())
-            streams = data.get("streams", [])
-            
-            if not streams:
-                return None
+    def _persist_lookup(self, cache_key: tuple[str, int, int]) -> VideoInfo | None:
+        """Fetch a still-fresh probe result from the sidecar cache.
 
-            video_stream = streams[0]
-            width = video_stream.get("width")
-            height = video_stream.get("height")
+        Blocking — must run in an executor.
 
-            if not width or not height:
+        Args:
+            cache_key: (path, mtime_ns, size) identifying the file state
+
+        Returns:
+            The stored VideoInfo if the row matches the current file
+            state, else None
+        """
+        try:
+            conn = self._open_persistent_cache()
+            if conn is None:
                 return None
+            with self._persist_lock:
+                row = conn.execute(
+                    "SELECT mtime_ns, size, width, height, aspect_ratio, "
+                    "codec, duration, has_thumbnail "
+                    "FROM probe_cache WHERE path = ?",
+                    (cache_key[0],),
+                ).fetchone()
+        except sqlite3.Error as err:
+            _LOGGER.debug("Persistent probe cache lookup failed: %s", err)
+            return None
+        if row is None or row[0] != cache_key[1] or row[1] != cache_key[2]:
+            return None
+        return VideoInfo(
+            width=row[2],
+            height=row[3],
+            aspect_ratio=row[4],
+            codec=row[5],
+            duration=row[6],
+            has_thumbnail=None if row[7] is None else bool(row[7]),
+        )
 
-            aspect_ratio = width / height
+    def _persist_store(
+        self, cache_key: tuple[str, int, int], result: VideoInfo
+    ) -> None:
+        """Write a probe result through to the sidecar cache.
 
-            return {
-                "width": width,
-                "height": height,
-                "aspect_ratio": aspect_ratio,
-                "codec": video_stream.get("codec_name"),
-                "duration": video_stream.get("duration"),
-            }
+        Blocking — must run in an executor.
 
-        except (json.JSONDecodeError, KeyError, TypeError) as err:
-            _LOGGER.debug("Failed to parse ffprobe output: %s", err)
-            return None
+        Args:
+            cache_key: (path, mtime_ns, size) identifying the file state
+            result: Probe result to persist
+        """
+        try:
+            conn = self._open_persistent_cache()
+            if conn is None:
+                return
+            with self._persist_lock:
+                conn.execute(
+                    "INSERT OR REPLACE INTO probe_cache VALUES "
+                    "(?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        cache_key[0],
+                        cache_key[1],
+                        cache_key[2],
+                        result.width,
+                        result.height,
+                        result.aspect_ratio,
+                        result.codec,
+                        result.duration,
+                        None if result.has_thumbnail is None else int(result.has_thumbnail),
+                    ),
+                )
+                conn.commit()
+        except sqlite3.Error as err:
+            _LOGGER.debug("Persistent probe cache store failed: %s", err)
+
+    def _cache_probe_result(
+        self,
+        cache_key: tuple[str, int, int] | None,
+        result: VideoInfo,
+        persist: bool = True,
+    ) -> None:
+        """Store a probe result in the LRU cache, evicting the oldest entry.
+
+        Args:
+            cache_key: Cache key, or None when the file couldn't be stat'ed
+            result: Probe result to cache
+            persist: Also write through to the sidecar cache; False when
+                the result just came from it
+        """
+        if cache_key is None:
+            return
+        self._probe_cache[cache_key] = result
+        self._probe_cache.move_to_end(cache_key)
+        if len(self._probe_cache) > _PROBE_CACHE_MAX:
+            self._probe_cache.popitem(last=False)
+        if persist and self.persistent_cache_path is not None:
+            # Fire-and-forget disk write; readers tolerate a missing row
+            asyncio.get_running_loop().run_in_executor(
+                None, self._persist_store, cache_key, result
+            )
+
+    async def _probe_all(
+        self, video_path: str, cache_key: tuple[str, int, int] | None = None
+    ) -> VideoInfo | None:
+        """Probe dimensions and thumbnail presence in one ffprobe run.
+
+        All streams are requested so the main video stream and any
+        attached_pic disposition come out of a single subprocess; both
+        get_video_dimensions and check_video_has_thumbnail feed off the
+        shared cache entry this populates.
 
-    async def _get_dimensions_with_ffmpeg(
-        self, video_path: str
-    ) -> dict[str, Any] | None:
-        """Get video dimensions using ffmpeg -i output parsing.
-        
         Args:
             video_path: Path to the video file
-            
+            cache_key: Probe-cache key when the caller already computed
+                it; None makes this method stat the file itself
+
         Returns:
-            Dictionary with video information or None if failed
+            VideoInfo (including has_thumbnail) or None if failed
         """
-        cmd = [self.ffmpeg_path, "-i", video_path]
+        if cache_key is None:
+            try:
+                loop = asyncio.get_running_loop()
+                stat_result = await loop.run_in_executor(None, os.stat, video_path)
+                cache_key = (video_path, stat_result.st_mtime_ns, stat_result.st_size)
+            except OSError:
+                cache_key = None
+            if cache_key is not None:
+                cached = self._probe_cache.get(cache_key)
+                # A pyav-sourced entry never looked for the thumbnail
+                # flag and doesn't satisfy this caller
+                if cached is not None and cached.has_thumbnail is not None:
+                    self._probe_cache.move_to_end(cache_key)
+                    return cached
+
+        # Only the fields the parser below reads; rich metadata
+        # (tags, side_data_list) would otherwise dominate the payload
+        cmd = [
+            self.ffprobe_path,
+            "-v", "error",
+            "-print_format", "json",
+            "-show_entries",
+            "stream=width,height,codec_name,codec_type,duration,display_aspect_ratio"
+            ":stream_disposition=attached_pic",
+            video_path,
+        ]
 
+        # stderr goes to /dev/null: the JSON on stdout is all we
+        # consume, and skipping the pipe saves a reader transport
+        process = await self._spawn(cmd, stderr=asyncio.subprocess.DEVNULL)
+        assert process.stdout is not None  # _spawn defaults stdout to PIPE
+        # With a single pipe there is nothing for communicate() to
+        # multiplex; read stdout to EOF and reap the child directly
         try:
-            process = await asyncio.create_subprocess_exec(
-                *cmd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
+            stdout = await process.stdout.read()
+            await process.wait()
+        except asyncio.CancelledError:
+            self._kill_process_group(process)
+            raise
+
+        if process.returncode != 0:
+            _LOGGER.debug(
+                "ffprobe returned non-zero exit code %s for %s",
+                process.returncode,
+                video_path,
             )
-            stdout, stderr = await process.communicate()
+            return None
 
-            # ffmpeg -i outputs to stderr
-            output = stderr.decode()
+        # The parse is the only step that can legitimately blow up on
+        # malformed output; everything below is .get() chains that
+        # degrade to None on their own. ValueError covers both
+        # orjson.JSONDecodeError and the stdlib json.JSONDecodeError.
+        try:
+            data = _json_loads(stdout)
+        except ValueError as err:
+            _LOGGER.debug("Failed to parse ffprobe output: %s", err)
+            return None
+        streams = data.get("streams", [])
+
+        # One pass over the streams: the first video stream that is
+        # not cover art is the main one, any attached_pic means an
+        # embedded thumbnail exists
+        main_stream = None
+        has_thumbnail = False
+        for stream in streams:
+            if stream.get("codec_type") != "video":
+                continue
+            if stream.get("disposition", {}).get("attached_pic") == 1:
+                has_thumbnail = True
+            elif main_stream is None:
+                main_stream = stream
+
+        if main_stream is None:
+            return None
 
-            # Parse the output for video stream information
-            # Look for pattern like "Stream #0:0: Video: ... 1920x1080"
-            pattern = r"Stream.*Video.*?(\d{2,5})x(\d{2,5})"
-            match = re.search(pattern, output)
+        width = main_stream.get("width")
+        height = main_stream.get("height")
 
-            if not match:
-                return None
+        if not width or not height:
+            return None
 
-            width = int(match.group(1))
-            height = int(match.group(2))
-            aspect_ratio = width / height
+        # Prefer the container's display aspect ratio when declared;
+        # anamorphic streams make width/height the wrong answer
+        aspect_ratio = width / height
+        dar = main_stream.get("display_aspect_ratio")
+        if dar and ":" in dar:
+            try:
+                dar_num, dar_den = dar.split(":", 1)
+                dar_num, dar_den = int(dar_num), int(dar_den)
+                if dar_num > 0 and dar_den > 0:
+                    aspect_ratio = dar_num / dar_den
+            except ValueError:
+                pass
+
+        # ffprobe reports duration as a decimal string
+        duration_str = main_stream.get("duration")
+        try:
+            duration = float(duration_str) if duration_str is not None else None
+        except ValueError:
+            duration = None
+
+        result = VideoInfo(
+            width=width,
+            height=height,
+            aspect_ratio=aspect_ratio,
+            codec=main_stream.get("codec_name"),
+            duration=duration,
+            has_thumbnail=has_thumbnail,
+        )
+        self._cache_probe_result(cache_key, result)
+        return result
 
-            return {
-                "width": width,
-                "height": height,
-                "aspect_ratio": aspect_ratio,
-            }
+    async def _get_dimensions_minimal(
+        self, video_path: str
+    ) -> VideoInfo | None:
+        """Get bare video dimensions from a minimal ffprobe run.
 
-        except (ValueError, AttributeError) as err:
-            _LOGGER.debug("Failed to parse ffmpeg output: %s", err)
-            return None
+        Retry path for when the full JSON probe fails: only the first
+        video stream's width and height are requested, in csv form, so
+        the output is a single "WxH" line with nothing to deserialize.
 
-    async def check_video_has_thumbnail(self, video_path: str) -> bool:
-        """Check if video has an embedded thumbnail.
-        
         Args:
             video_path: Path to the video file
-            
+
         Returns:
-            True if video has an embedded thumbnail
+            VideoInfo with bare dimensions or None if failed
         """
         cmd = [
             self.ffprobe_path,
-            "-v", "quiet",
-            "-print_format", "json",
-            "-show_streams",
+            "-v", "error",
+            "-select_streams", "v:0",
+            "-show_entries", "stream=width,height",
+            "-of", "csv=p=0:s=x",
             video_path,
         ]
 
         try:
-            process = await asyncio.create_subprocess_exec(
-                *cmd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-            )
-            stdout, stderr = await process.communicate()
+            process = await self._spawn(cmd, stderr=asyncio.subprocess.DEVNULL)
+            assert process.stdout is not None  # _spawn defaults stdout to PIPE
+            try:
+                stdout = await process.stdout.read()
+                await process.wait()
+            except asyncio.CancelledError:
+                self._kill_process_group(process)
+                raise
 
             if process.returncode != 0:
-                _LOGGER.debug(
-                    "ffprobe returned non-zero exit code: %s", stderr.decode()
-                )
-                return False
+                return None
 
-            data = json.loads(stdout.decode())
-            streams = data.get("streams", [])
-            
-            # Check if any stream has disposition attached_pic
-            for stream in streams:
-                if stream.get("codec_type") == "video":
-                    disposition = stream.get("disposition", {})
-                    if disposition.get("attached_pic") == 1:
-                        return True
-            
-            return False
+            width_str, _, height_str = stdout.decode().strip().partition("x")
+            width = int(width_str)
+            height = int(height_str)
+            if width <= 0 or height <= 0:
+                return None
 
-        except (json.JSONDecodeError, KeyError, TypeError) as err:
-            _LOGGER.debug("Failed to check for thumbnail: %s", err)
-            return False
+            return VideoInfo(
+                width=width,
+                height=height,
+                aspect_ratio=width / height,
+            )
+
+        except ValueError as err:
+            _LOGGER.debug("Failed to parse minimal probe output: %s", err)
+            return None
+
+    async def gather_dimensions(
+        self, video_paths: list[str], max_concurrency: int = 4
+    ) -> dict[str, VideoInfo | None]:
+        """Probe several files concurrently through the probe cache.
+
+        Args:
+            video_paths: Paths of the video files to probe
+            max_concurrency: Upper bound on simultaneous ffprobe spawns
+
+        Returns:
+            Mapping of path to probe result, None where probing failed
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def probe(path: str) -> VideoInfo | None:
+            async with semaphore:
+                try:
+                    return await self.get_video_dimensions(path)
+                except (ValueError, OSError) as err:
+                    _LOGGER.debug("Probe failed for %s: %s", path, err)
+                    return None
+
+        probed = await asyncio.gather(*(probe(path) for path in video_paths))
+        return dict(zip(video_paths, probed))
+
+    async def check_video_has_thumbnail(self, video_path: str) -> bool:
+        """Check if video has an embedded thumbnail.
+        
+        Args:
+            video_path: Path to the video file
+            
+        Returns:
+            True if video has an embedded thumbnail
+        """
+        # Thin wrapper over the combined probe; usually a cache hit
+        # since the dimensions were probed moments earlier
+        probe = await self._probe_all(video_path)
+        return bool(probe and probe.has_thumbnail)
 
     async def analyze_video_needs_processing(
         self,
@@ -305,7 +1011,7 @@ class VideoProcessor:
         _LOGGER.info("Analyzing video processing requirements: %s", video_path)
 
         if target_aspect_ratio is None:
-            target_aspect_ratio = 16 / 9
+            target_aspect_ratio = self.DEFAULT_ASPECT_RATIO
 
         analysis: dict[str, Any] = {
             "needs_processing": False,
@@ -315,33 +1021,22 @@ class VideoProcessor:
         try:
             # Get video dimensions
             info = await self.get_video_dimensions(video_path)
-            current_aspect_ratio = info["aspect_ratio"]
-            current_width = info["width"]
-            current_height = info["height"]
+            current_aspect_ratio = info.aspect_ratio
+            current_width = info.width
+            current_height = info.height
 
             # Check if resize is needed
             if resize_width or resize_height:
-                # Calculate target dimensions
-                video_aspect_ratio = current_width / current_height
-                
-                if resize_width and resize_height:
-                    needs_resize = (
-                        current_width != resize_width or 
-                        current_height != resize_height
-                    )
-                elif resize_width:
-                    target_height = int(resize_width / video_aspect_ratio)
-                    needs_resize = (
-                        current_width != resize_width or 
-                        current_height != target_height
-                    )
-                else:  # resize_height only
-                    target_width = int(resize_height * video_aspect_ratio)
-                    needs_resize = (
-                        current_width != target_width or 
-                        current_height != resize_height
-                    )
-                
+                target_width, target_height = self._target_dims(
+                    current_width, current_height, resize_width, resize_height
+                )
+                # Encoders nudge one axis to satisfy mod-2 constraints;
+                # a ±1 px match is not worth a full re-encode
+                needs_resize = (
+                    abs(current_width - target_width) > 1
+                    or abs(current_height - target_height) > 1
+                )
+
                 if needs_resize:
                     analysis["needs_processing"] = True
                     analysis["reasons"].append("Video dimensions differ from target")
@@ -364,11 +1059,7 @@ class VideoProcessor:
                     analysis["reasons"].append("Video does not have embedded thumbnail")
 
             # Add video info to analysis
-            analysis["video_info"] = {
-                "width": current_width,
-                "height": current_height,
-                "aspect_ratio": current_aspect_ratio,
-            }
+            analysis["video_info"] = info.as_dict()
             
             # Log analysis results
             if analysis["needs_processing"]:
@@ -387,53 +1078,201 @@ class VideoProcessor:
 
         return analysis
 
-    async def generate_thumbnail(
-        self, video_path: str, thumbnail_path: str, timestamp: str = "00:00:01"
+    async def generate_thumbnail(
+        self,
+        video_path: str,
+        thumbnail_path: str,
+        timestamp: str = "00:00:01",
+        accurate_seek: bool = False,
+    ) -> bool:
+        """Generate a thumbnail from video at specified timestamp.
+
+        Args:
+            video_path: Path to the video file
+            thumbnail_path: Path where thumbnail should be saved
+            timestamp: Timestamp for thumbnail (format: HH:MM:SS)
+            accurate_seek: Decode every frame up to the timestamp instead
+                of jumping to the nearest keyframe; frame-exact, but pays
+                for the full decode
+
+        Returns:
+            True if thumbnail was generated successfully
+        """
+        _LOGGER.info("Generating thumbnail for video: %s", video_path)
+
+        # -ss before -i seeks on the demuxer (keyframe jump) rather than
+        # decoding from the start of the file; any nearby frame is as
+        # good as the exact one for a preview image
+        if accurate_seek:
+            seek_args = ["-i", video_path, "-ss", timestamp]
+        else:
+            seek_args = ["-ss", timestamp, "-i", video_path]
+
+        cmd = [
+            self.ffmpeg_path,
+            *seek_args,
+            "-vframes", "1",
+            "-q:v", "2",
+            "-y",  # Overwrite output file
+            thumbnail_path,
+        ]
+
+        try:
+            # ffmpeg writes its product to the output file; stdout stays
+            # silent, so no pipe (and no reader transport) is needed for it
+            async with self._encode_sem:
+                process = await self._spawn(cmd, stdout=asyncio.subprocess.DEVNULL)
+                _, stderr = await self._reap(process)
+
+            if process.returncode != 0:
+                _LOGGER.error(
+                    "Failed to generate thumbnail: %s", stderr.decode()
+                )
+                return False
+
+            # Exit status 0 means ffmpeg wrote the frame; no need to
+            # stat the output to double-check
+            _LOGGER.info("Thumbnail generated successfully at %s", thumbnail_path)
+            return True
+
+        except Exception as err:
+            _LOGGER.error("Error generating thumbnail: %s", err)
+            return False
+
+    async def generate_thumbnails_batch(
+        self, jobs: list[tuple[str, str, str]]
+    ) -> list[bool]:
+        """Grab thumbnails for many videos with bounded concurrency.
+
+        The extractions all run overlapped — each generate_thumbnail
+        call queues on the shared encode semaphore, so ffmpeg startup
+        and disk reads are amortized across the batch without ever
+        oversubscribing the CPUs. A single ffmpeg process is not shared
+        across inputs since seek semantics differ per file.
+
+        Args:
+            jobs: (video_path, thumbnail_path, timestamp) triples
+
+        Returns:
+            One success flag per job, in order
+        """
+        return list(
+            await asyncio.gather(
+                *(
+                    self.generate_thumbnail(video_path, thumbnail_path, timestamp)
+                    for video_path, thumbnail_path, timestamp in jobs
+                )
+            )
+        )
+
+    async def _generate_thumbnail_bytes(
+        self, video_path: str, timestamp: str = "00:00:01"
+    ) -> bytes | None:
+        """Grab a thumbnail frame as in-memory JPEG bytes.
+
+        Companion to generate_thumbnail that skips the on-disk JPEG so
+        the embed step can consume the frame straight from memory.
+
+        Args:
+            video_path: Path to the video file
+            timestamp: Timestamp for thumbnail (format: HH:MM:SS)
+
+        Returns:
+            The encoded JPEG bytes, or None on failure
+        """
+        cmd = [
+            self.ffmpeg_path,
+            "-ss", timestamp,
+            "-i", video_path,
+            "-vframes", "1",
+            "-q:v", "2",
+            "-f", "image2pipe",
+            "-c:v", "mjpeg",
+            "-",
+        ]
+
+        try:
+            async with self._encode_sem:
+                process = await self._spawn(cmd, stderr=asyncio.subprocess.DEVNULL)
+                assert process.stdout is not None  # _spawn defaults stdout to PIPE
+                try:
+                    stdout = await process.stdout.read()
+                    await process.wait()
+                except asyncio.CancelledError:
+                    self._kill_process_group(process)
+                    raise
+
+            if process.returncode != 0 or not stdout:
+                _LOGGER.error("Failed to grab thumbnail frame for %s", video_path)
+                return None
+            return stdout
+
+        except Exception as err:
+            _LOGGER.error("Error generating thumbnail: %s", err)
+            return None
+
+    async def _embed_thumbnail_bytes(
+        self, video_path: str, output_video_path: str, jpg_bytes: bytes
     ) -> bool:
-        """Generate a thumbnail from video at specified timestamp.
-        
+        """Embed an in-memory JPEG as the video's attached_pic stream.
+
+        The image arrives on the child's stdin, so the thumbnail never
+        does a write+read round-trip through the filesystem.
+
         Args:
-            video_path: Path to the video file
-            thumbnail_path: Path where thumbnail should be saved
-            timestamp: Timestamp for thumbnail (format: HH:MM:SS)
-            
+            video_path: Path to the input video file
+            output_video_path: Path where the output video will be saved
+            jpg_bytes: Encoded JPEG to embed
+
         Returns:
-            True if thumbnail was generated successfully
+            True if the thumbnail was embedded successfully
         """
-        _LOGGER.info("Generating thumbnail for video: %s", video_path)
-
         cmd = [
             self.ffmpeg_path,
+            "-threads", "0",
             "-i", video_path,
-            "-ss", timestamp,
-            "-vframes", "1",
-            "-q:v", "2",
-            "-y",  # Overwrite output file
-            thumbnail_path,
+            "-f", "image2pipe",
+            "-i", "pipe:0",
+            "-map", "0",
+            "-map", "1",
+            "-c", "copy",
+            "-disposition:v:1", "attached_pic",
+            "-y",
+            output_video_path,
         ]
 
         try:
-            process = await asyncio.create_subprocess_exec(
-                *cmd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-            )
-            stdout, stderr = await process.communicate()
+            async with self._encode_sem:
+                process = await self._spawn(
+                    cmd,
+                    stdin=asyncio.subprocess.PIPE,
+                    stdout=asyncio.subprocess.DEVNULL,
+                )
+                try:
+                    _, stderr = await process.communicate(jpg_bytes)
+                except asyncio.CancelledError:
+                    self._kill_process_group(process)
+                    raise
 
             if process.returncode != 0:
-                _LOGGER.error(
-                    "Failed to generate thumbnail: %s", stderr.decode()
-                )
+                _LOGGER.error("Failed to embed thumbnail: %s", stderr.decode())
+                loop = asyncio.get_running_loop()
+                try:
+                    await loop.run_in_executor(None, os.remove, output_video_path)
+                except FileNotFoundError:
+                    pass
                 return False
 
-            if os.path.exists(thumbnail_path):
-                _LOGGER.info("Thumbnail generated successfully at %s", thumbnail_path)
-                return True
-            
-            return False
+            _LOGGER.info("Thumbnail embedded successfully")
+            return True
 
         except Exception as err:
-            _LOGGER.error("Error generating thumbnail: %s", err)
+            _LOGGER.error("Error embedding thumbnail: %s", err)
+            loop = asyncio.get_running_loop()
+            try:
+                await loop.run_in_executor(None, os.remove, output_video_path)
+            except OSError:
+                pass
             return False
 
     async def embed_thumbnail(self, video_path: str, output_video_path: str, thumbnail_path: str) -> bool:
@@ -451,6 +1290,7 @@ class VideoProcessor:
 
         cmd = [
             self.ffmpeg_path,
+            "-threads", "0",
             "-i", video_path,
             "-i", thumbnail_path,
             "-map", "0",
@@ -462,21 +1302,23 @@ class VideoProcessor:
         ]
 
         try:
-            process = await asyncio.create_subprocess_exec(
-                *cmd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-            )
-            stdout, stderr = await process.communicate()
+            # ffmpeg writes its product to the output file; stdout stays
+            # silent, so no pipe (and no reader transport) is needed for it
+            async with self._encode_sem:
+                process = await self._spawn(cmd, stdout=asyncio.subprocess.DEVNULL)
+                _, stderr = await self._reap(process)
 
             if process.returncode != 0:
                 _LOGGER.error(
                     "Failed to embed thumbnail: %s", stderr.decode()
                 )
-                # Clean up output file if it exists
+                # Remove any partial output; a missing file just means
+                # ffmpeg never got to create it (one syscall either way)
                 loop = asyncio.get_running_loop()
-                if await loop.run_in_executor(None, os.path.exists, output_video_path):
+                try:
                     await loop.run_in_executor(None, os.remove, output_video_path)
+                except FileNotFoundError:
+                    pass
                 return False
 
             _LOGGER.info("Thumbnail embedded successfully")
@@ -484,40 +1326,51 @@ class VideoProcessor:
 
         except Exception as err:
             _LOGGER.error("Error embedding thumbnail: %s", err)
-            # Clean up output file if it exists
+            # Remove any partial output; missing or busy is fine here
             loop = asyncio.get_running_loop()
-            if await loop.run_in_executor(None, os.path.exists, output_video_path):
-                try:
-                    await loop.run_in_executor(None, os.remove, output_video_path)
-                except Exception:
-                    pass
+            try:
+                await loop.run_in_executor(None, os.remove, output_video_path)
+            except OSError:
+                pass
             return False
 
     async def normalize_aspect_ratio(
-        self, video_path: str, output_video_path: str, target_aspect_ratio: float | None = None
+        self,
+        video_path: str,
+        output_video_path: str,
+        target_aspect_ratio: float | None = None,
+        info: VideoInfo | None = None,
+        mode: str = "pad",
     ) -> bool:
         """Normalize video aspect ratio to prevent square or distorted previews.
-        
+
         Args:
             video_path: Path to the input video file
             output_video_path: Path where the output video will be saved
             target_aspect_ratio: Target aspect ratio (default: 16/9 = 1.777...)
-            
+            info: Optional already-probed video information; saves the
+                probe when the caller has it
+            mode: "pad" re-encodes with real letterbox pixels (the
+                service behaviour); "metadata" stream-copies and only
+                rewrites the container's display aspect ratio, which is
+                near-free but relies on the player honouring the hint
+
         Returns:
             True if normalization was successful
         """
         if target_aspect_ratio is None:
-            target_aspect_ratio = 16 / 9  # Default to 16:9
+            target_aspect_ratio = self.DEFAULT_ASPECT_RATIO
 
-        # Get current dimensions
-        try:
-            info = await self.get_video_dimensions(video_path)
-        except Exception as err:
-            _LOGGER.error("Failed to get video dimensions: %s", err)
-            return False
+        # Get current dimensions unless the caller already probed them
+        if info is None:
+            try:
+                info = await self.get_video_dimensions(video_path)
+            except Exception as err:
+                _LOGGER.error("Failed to get video dimensions: %s", err)
+                return False
+
+        current_aspect_ratio = info.aspect_ratio
 
-        current_aspect_ratio = info["aspect_ratio"]
-        
         # Check if normalization is needed (with small tolerance)
         if abs(current_aspect_ratio - target_aspect_ratio) < self.ASPECT_RATIO_TOLERANCE:
             _LOGGER.debug(
@@ -526,7 +1379,7 @@ class VideoProcessor:
             # Copy input to output since no processing is needed
             try:
                 loop = asyncio.get_running_loop()
-                await loop.run_in_executor(None, shutil.copy2, video_path, output_video_path)
+                await loop.run_in_executor(None, _passthrough, video_path, output_video_path)
                 return True
             except Exception as err:
                 _LOGGER.error("Failed to copy video file: %s", err)
@@ -538,10 +1391,51 @@ class VideoProcessor:
             target_aspect_ratio,
         )
 
+        if mode == "metadata":
+            # Remux with the display aspect ratio rewritten; no decode,
+            # no encode, runs at copy speed
+            cmd = [
+                self.ffmpeg_path,
+                "-i", video_path,
+                "-c", "copy",
+                "-aspect", f"{target_aspect_ratio:.6f}",
+                "-y",
+                output_video_path,
+            ]
+
+            try:
+                async with self._encode_sem:
+                    process = await self._spawn(cmd, stdout=asyncio.subprocess.DEVNULL)
+                    _, stderr = await self._reap(process)
+
+                if process.returncode != 0:
+                    _LOGGER.error(
+                        "Failed to set aspect ratio metadata: %s", stderr.decode()
+                    )
+                    loop = asyncio.get_running_loop()
+                    try:
+                        await loop.run_in_executor(None, os.remove, output_video_path)
+                    except FileNotFoundError:
+                        pass
+                    return False
+
+                _LOGGER.info("Aspect ratio metadata updated successfully")
+                return True
+
+            except Exception as err:
+                _LOGGER.error("Error setting aspect ratio metadata: %s", err)
+                loop = asyncio.get_running_loop()
+                try:
+                    await loop.run_in_executor(None, os.remove, output_video_path)
+                except OSError:
+                    pass
+                return False
+
         # Calculate new dimensions
-        width = info["width"]
-        height = info["height"]
-        
+        width = info.width
+        height = info.height
+
+
         if current_aspect_ratio > target_aspect_ratio:
             # Video is wider, add padding top/bottom
             new_height = int(width / target_aspect_ratio)
@@ -555,34 +1449,46 @@ class VideoProcessor:
             pad_left = pad_width // 2
             filter_complex = f"pad={new_width}:{height}:{pad_left}:0:black"
 
+        hwenc = await self._detect_hw_encoder()
+        device_args: list[str] = []
+        if hwenc:
+            # Offload the decode as well; "auto" quietly falls back to
+            # software when no hardware decoder matches the input codec
+            device_args = ["-hwaccel", "auto"]
+        if hwenc == "h264_vaapi":
+            filter_complex = f"{filter_complex},format=nv12,hwupload"
+            device_args += ["-vaapi_device", "/dev/dri/renderD128"]
+
         cmd = [
             self.ffmpeg_path,
+            "-threads", "0",
+            *device_args,
             "-i", video_path,
             "-vf", filter_complex,
-            "-c:v", "libx264",
-            "-preset", "medium",
-            "-crf", "23",
+            *self._video_encoder_args(hwenc),
             "-c:a", "copy",
             "-y",
             output_video_path,
         ]
 
         try:
-            process = await asyncio.create_subprocess_exec(
-                *cmd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-            )
-            stdout, stderr = await process.communicate()
+            # ffmpeg writes its product to the output file; stdout stays
+            # silent, so no pipe (and no reader transport) is needed for it
+            async with self._encode_sem:
+                process = await self._spawn(cmd, stdout=asyncio.subprocess.DEVNULL)
+                _, stderr = await self._reap(process)
 
             if process.returncode != 0:
                 _LOGGER.error(
                     "Failed to normalize aspect ratio: %s", stderr.decode()
                 )
-                # Clean up output file if it exists
+                # Remove any partial output; a missing file just means
+                # ffmpeg never got to create it (one syscall either way)
                 loop = asyncio.get_running_loop()
-                if await loop.run_in_executor(None, os.path.exists, output_video_path):
+                try:
                     await loop.run_in_executor(None, os.remove, output_video_path)
+                except FileNotFoundError:
+                    pass
                 return False
 
             _LOGGER.info("Aspect ratio normalized successfully")
@@ -590,18 +1496,17 @@ class VideoProcessor:
 
         except Exception as err:
             _LOGGER.error("Error normalizing aspect ratio: %s", err)
-            # Clean up output file if it exists
+            # Remove any partial output; missing or busy is fine here
             loop = asyncio.get_running_loop()
-            if await loop.run_in_executor(None, os.path.exists, output_video_path):
-                try:
-                    await loop.run_in_executor(None, os.remove, output_video_path)
-                except Exception:
-                    pass
+            try:
+                await loop.run_in_executor(None, os.remove, output_video_path)
+            except OSError:
+                pass
             return False
 
     async def resize_video(
-        self, video_path: str, output_video_path: str, target_width: int | None = None, 
-        target_height: int | None = None
+        self, video_path: str, output_video_path: str, target_width: int | None = None,
+        target_height: int | None = None, info: VideoInfo | None = None
     ) -> bool:
         """Resize video to specified dimensions.
         
@@ -610,6 +1515,8 @@ class VideoProcessor:
             output_video_path: Path where the output video will be saved
             target_width: Target width (None to maintain aspect ratio)
             target_height: Target height (None to maintain aspect ratio)
+            info: Optional already-probed video information; saves the
+                probe when the caller has it
             
         Returns:
             True if resize was successful
@@ -618,38 +1525,29 @@ class VideoProcessor:
             _LOGGER.warning("No target dimensions specified for resize")
             return False
 
-        # Get current dimensions
-        try:
-            info = await self.get_video_dimensions(video_path)
-        except Exception as err:
-            _LOGGER.error("Failed to get video dimensions: %s", err)
-            return False
+        # Get current dimensions unless the caller already probed them
+        if info is None:
+            try:
+                info = await self.get_video_dimensions(video_path)
+            except Exception as err:
+                _LOGGER.error("Failed to get video dimensions: %s", err)
+                return False
 
-        current_width = info["width"]
-        current_height = info["height"]
+        current_width = info.width
+        current_height = info.height
 
         # Calculate target dimensions maintaining aspect ratio if needed
-        new_width: int
-        new_height: int
-        if target_width and target_height:
-            new_width = target_width
-            new_height = target_height
-        elif target_width:
-            new_width = target_width
-            new_height = int(target_width / (current_width / current_height))
-        else:  # target_height only
-            if target_height is None:
-                raise ValueError("Either target_width or target_height must be provided")
-            new_height = target_height
-            new_width = int(target_height * (current_width / current_height))
-
-        # Check if resize is needed
-        if new_width == current_width and new_height == current_height:
+        new_width, new_height = self._target_dims(
+            current_width, current_height, target_width, target_height
+        )
+
+        # Check if resize is needed (±1 px tolerates mod-2 rounding)
+        if abs(new_width - current_width) <= 1 and abs(new_height - current_height) <= 1:
             _LOGGER.debug("Video already has target dimensions")
             # Copy input to output since no processing is needed
             try:
                 loop = asyncio.get_running_loop()
-                await loop.run_in_executor(None, shutil.copy2, video_path, output_video_path)
+                await loop.run_in_executor(None, _passthrough, video_path, output_video_path)
                 return True
             except Exception as err:
                 _LOGGER.error("Failed to copy video file: %s", err)
@@ -660,34 +1558,47 @@ class VideoProcessor:
             current_width, current_height, new_width, new_height
         )
 
+        hwenc = await self._detect_hw_encoder()
+        scale_filter = f"scale={new_width}:{new_height}"
+        device_args: list[str] = []
+        if hwenc:
+            # Offload the decode as well; "auto" quietly falls back to
+            # software when no hardware decoder matches the input codec
+            device_args = ["-hwaccel", "auto"]
+        if hwenc == "h264_vaapi":
+            scale_filter = f"{scale_filter},format=nv12,hwupload"
+            device_args += ["-vaapi_device", "/dev/dri/renderD128"]
+
         cmd = [
             self.ffmpeg_path,
+            "-threads", "0",
+            *device_args,
             "-i", video_path,
-            "-vf", f"scale={new_width}:{new_height}",
-            "-c:v", "libx264",
-            "-preset", "medium",
-            "-crf", "23",
+            "-vf", scale_filter,
+            *self._video_encoder_args(hwenc),
             "-c:a", "copy",
             "-y",
             output_video_path,
         ]
 
         try:
-            process = await asyncio.create_subprocess_exec(
-                *cmd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-            )
-            stdout, stderr = await process.communicate()
+            # ffmpeg writes its product to the output file; stdout stays
+            # silent, so no pipe (and no reader transport) is needed for it
+            async with self._encode_sem:
+                process = await self._spawn(cmd, stdout=asyncio.subprocess.DEVNULL)
+                _, stderr = await self._reap(process)
 
             if process.returncode != 0:
                 _LOGGER.error(
                     "Failed to resize video: %s", stderr.decode()
                 )
-                # Clean up output file if it exists
+                # Remove any partial output; a missing file just means
+                # ffmpeg never got to create it (one syscall either way)
                 loop = asyncio.get_running_loop()
-                if await loop.run_in_executor(None, os.path.exists, output_video_path):
+                try:
                     await loop.run_in_executor(None, os.remove, output_video_path)
+                except FileNotFoundError:
+                    pass
                 return False
 
             _LOGGER.info("Video resized successfully")
@@ -695,15 +1606,389 @@ class VideoProcessor:
 
         except Exception as err:
             _LOGGER.error("Error resizing video: %s", err)
-            # Clean up output file if it exists
+            # Remove any partial output; missing or busy is fine here
+            loop = asyncio.get_running_loop()
+            try:
+                await loop.run_in_executor(None, os.remove, output_video_path)
+            except OSError:
+                pass
+            return False
+
+    async def _resolve_output_path(
+        self,
+        video_path: str,
+        output_path: str | None,
+        output_name: str | None,
+        overwrite: bool,
+    ) -> str:
+        """Determine the final output path for a processing run.
+
+        Args:
+            video_path: Path to the input video file
+            output_path: Optional output directory path
+            output_name: Optional output filename
+            overwrite: Whether the original file will be overwritten
+
+        Returns:
+            The resolved output file path
+        """
+        if overwrite:
+            # When overwriting, we work with temp files and replace at the end
+            return video_path
+
+        video_dir = os.path.dirname(video_path)
+        video_basename = os.path.basename(video_path)
+
+        if output_path:
+            # Use specified output directory, creating it if needed
             loop = asyncio.get_running_loop()
-            if await loop.run_in_executor(None, os.path.exists, output_video_path):
+            await loop.run_in_executor(
+                None, functools.partial(os.makedirs, output_path, exist_ok=True)
+            )
+            target_dir = output_path
+        else:
+            # Use same directory as input
+            target_dir = video_dir
+
+        return os.path.join(target_dir, output_name or video_basename)
+
+    def _compute_transform(
+        self,
+        info: VideoInfo,
+        resize_width: int | None,
+        resize_height: int | None,
+        normalize_aspect: bool,
+        target_aspect_ratio: float | None,
+    ) -> tuple[int, int, str | None]:
+        """Compute the final dimensions and the fused scale/pad filter.
+
+        Args:
+            info: Probed video information (width, height, aspect_ratio)
+            resize_width: Optional target width for resizing
+            resize_height: Optional target height for resizing
+            normalize_aspect: Whether to normalize aspect ratio
+            target_aspect_ratio: Optional target aspect ratio (default: 16/9)
+
+        Returns:
+            Tuple of (final width, final height, filter chain or None when
+            no pixel transform is needed)
+        """
+        width = info.width
+        height = info.height
+        # Seed from the DAR-corrected ratio so anamorphic inputs get the
+        # same verdict here as in analyze_video_needs_processing; for
+        # square-pixel files it equals width / height exactly
+        aspect_ratio = info.aspect_ratio
+        filters: list[str] = []
+
+        if resize_width or resize_height:
+            new_width, new_height = self._target_dims(
+                width, height, resize_width, resize_height
+            )
+            # ±1 px tolerates mod-2 rounding; when skipping, keep the
+            # true dimensions so final_dimensions stays honest
+            if abs(new_width - width) > 1 or abs(new_height - height) > 1:
+                filters.append(f"scale={new_width}:{new_height}")
+                width, height = new_width, new_height
+                # An explicit resize redefines the geometry in square pixels
+                aspect_ratio = width / height
+
+        if normalize_aspect and not (
+            target_aspect_ratio is None
+            and aspect_ratio == width / height
+            and (width, height) in _COMMON_16_9_RESOLUTIONS
+        ):
+            target = (
+                self.DEFAULT_ASPECT_RATIO
+                if target_aspect_ratio is None
+                else target_aspect_ratio
+            )
+            if abs(aspect_ratio - target) >= self.ASPECT_RATIO_TOLERANCE:
+                if aspect_ratio > target:
+                    # Video is wider, add padding top/bottom
+                    new_height = int(width / target)
+                    pad_top = (new_height - height) // 2
+                    filters.append(f"pad={width}:{new_height}:0:{pad_top}:black")
+                    height = new_height
+                else:
+                    # Video is taller, add padding left/right
+                    new_width = int(height * target)
+                    pad_left = (new_width - width) // 2
+                    filters.append(f"pad={new_width}:{height}:{pad_left}:0:black")
+                    width = new_width
+
+        return width, height, ",".join(filters) if filters else None
+
+    async def _run_transform(
+        self,
+        video_path: str,
+        output_video_path: str,
+        video_filter: str,
+        attach_thumbnail: bool = False,
+    ) -> bool:
+        """Run the fused scale/pad transform as a single ffmpeg encode.
+
+        With attach_thumbnail the decoded frames are split in the filter
+        graph and one representative frame is encoded as an mjpeg
+        attached_pic stream in the same run, so no second decode pass is
+        needed to produce the embedded thumbnail.
+
+        Args:
+            video_path: Path to the input video file
+            output_video_path: Path where the output video will be saved
+            video_filter: scale/pad filter chain to apply
+            attach_thumbnail: Whether to embed a thumbnail in the same pass
+
+        Returns:
+            True if the transform was successful
+        """
+        _LOGGER.info("Applying video transform '%s' to: %s", video_filter, video_path)
+
+        hwenc = await self._detect_hw_encoder()
+        main_filter = video_filter
+        device_args: list[str] = []
+        if hwenc:
+            # Offload the decode as well; "auto" quietly falls back to
+            # software when no hardware decoder matches the input codec
+            device_args = ["-hwaccel", "auto"]
+        if hwenc == "h264_vaapi":
+            # Frames are filtered in software, then uploaded to the GPU
+            # only for the expensive encode step
+            main_filter = f"{video_filter},format=nv12,hwupload"
+            device_args += ["-vaapi_device", "/dev/dri/renderD128"]
+
+        if attach_thumbnail:
+            # The thumbnail filter picks a representative frame, so this
+            # also works for clips shorter than a fixed seek offset
+            filter_complex = (
+                f"[0:v:0]split=2[main][thumb];"
+                f"[main]{main_filter}[v];"
+                f"[thumb]thumbnail,scale=320:-2[t]"
+            )
+            cmd = [
+                self.ffmpeg_path,
+                "-threads", "0",
+                *device_args,
+                "-i", video_path,
+                "-filter_complex", filter_complex,
+                "-map", "[v]",
+                "-map", "0:a?",
+                "-map", "[t]",
+                *self._video_encoder_args(hwenc, "v:0"),
+                "-c:a", "copy",
+                "-c:v:1", "mjpeg",
+                "-frames:v:1", "1",
+                "-q:v:1", "2",
+                "-disposition:v:1", "attached_pic",
+                "-y",
+                output_video_path,
+            ]
+        else:
+            cmd = [
+                self.ffmpeg_path,
+                "-threads", "0",
+                *device_args,
+                "-i", video_path,
+                "-vf", main_filter,
+                *self._video_encoder_args(hwenc),
+                "-c:a", "copy",
+                "-y",
+                output_video_path,
+            ]
+
+        try:
+            # ffmpeg writes its product to the output file; stdout stays
+            # silent, so no pipe (and no reader transport) is needed for it
+            async with self._encode_sem:
+                process = await self._spawn(cmd, stdout=asyncio.subprocess.DEVNULL)
+                _, stderr = await self._reap(process)
+
+            if process.returncode != 0:
+                _LOGGER.error(
+                    "Failed to transform video: %s", stderr.decode()
+                )
+                # Remove any partial output; a missing file just means
+                # ffmpeg never got to create it (one syscall either way)
+                loop = asyncio.get_running_loop()
                 try:
                     await loop.run_in_executor(None, os.remove, output_video_path)
-                except Exception:
+                except FileNotFoundError:
                     pass
+                return False
+
+            _LOGGER.info("Video transform applied successfully")
+            return True
+
+        except Exception as err:
+            _LOGGER.error("Error transforming video: %s", err)
+            # Remove any partial output; missing or busy is fine here
+            loop = asyncio.get_running_loop()
+            try:
+                await loop.run_in_executor(None, os.remove, output_video_path)
+            except OSError:
+                pass
             return False
 
+    async def _apply_operations(
+        self,
+        video_path: str,
+        info: VideoInfo,
+        results: dict[str, Any],
+        scratch_dir: str,
+        normalize_aspect: bool,
+        generate_thumbnail: bool,
+        resize_width: int | None,
+        resize_height: int | None,
+        target_aspect_ratio: float | None,
+    ) -> str:
+        """Run the transform stage: resize, aspect normalization, thumbnail.
+
+        Resize, aspect-ratio padding and thumbnail embedding are fused
+        into one ffmpeg encode so the pixels are decoded and re-encoded
+        only once, instead of a full pass per operation. Only a
+        thumbnail-only request still uses the standalone grab + remux
+        helpers, since no re-encode is involved there.
+
+        Records per-operation success in results["operations"].
+
+        Args:
+            video_path: Path to the input video file
+            info: Probed video information for the input file
+            results: Results dictionary being built by process_video
+            scratch_dir: Directory receiving all intermediate files
+            normalize_aspect: Whether to normalize aspect ratio
+            generate_thumbnail: Whether to generate and embed thumbnail
+            resize_width: Optional target width for resizing
+            resize_height: Optional target height for resizing
+            target_aspect_ratio: Optional target aspect ratio
+
+        Returns:
+            Path to the latest processed file
+        """
+        # Working file starts as the input
+        current_video = video_path
+
+        # Fused path: resize + aspect padding + thumbnail embed all ride
+        # the same decode/encode pass. The computed dimensions double as
+        # the final dimensions, saving a re-probe of the output file.
+        final_width, final_height, video_filter = self._compute_transform(
+            info, resize_width, resize_height, normalize_aspect, target_aspect_ratio
+        )
+        if video_filter is not None:
+            # Preserve original extension for ffmpeg format detection
+            ext = os.path.splitext(video_path)[1]
+            temp_output = os.path.join(scratch_dir, f"transform{ext}")
+            transform_success = await self._run_transform(
+                current_video,
+                temp_output,
+                video_filter,
+                attach_thumbnail=generate_thumbnail,
+            )
+            if resize_width or resize_height:
+                results["operations"]["resize"] = transform_success
+            if normalize_aspect:
+                results["operations"]["normalize_aspect"] = transform_success
+            if generate_thumbnail:
+                results["operations"]["generate_thumbnail"] = transform_success
+                results["operations"]["embed_thumbnail"] = transform_success
+            if transform_success:
+                current_video = temp_output
+                results["final_dimensions"] = {
+                    "width": final_width,
+                    "height": final_height,
+                    "aspect_ratio": final_width / final_height,
+                }
+            else:
+                _LOGGER.warning("Video transform failed")
+                results["final_dimensions"] = dict(results["original_dimensions"])
+            return current_video
+
+        # Requested transforms are no-ops for this input; report them
+        # as successful without copying any bytes. The pixels are
+        # untouched from here on, so the input dimensions are final.
+        results["final_dimensions"] = dict(results["original_dimensions"])
+        if resize_width or resize_height:
+            results["operations"]["resize"] = True
+        if normalize_aspect:
+            results["operations"]["normalize_aspect"] = True
+
+        # Thumbnail-only path: one frame grab plus a stream-copy remux.
+        # The frame stays in memory between the two, never touching disk
+        if generate_thumbnail:
+            jpg_bytes = await self._generate_thumbnail_bytes(current_video)
+            results["operations"]["generate_thumbnail"] = jpg_bytes is not None
+
+            if jpg_bytes is not None:
+                # Preserve original extension for ffmpeg format detection
+                ext = os.path.splitext(video_path)[1]
+                temp_output = os.path.join(scratch_dir, f"thumbnail{ext}")
+                embed_success = await self._embed_thumbnail_bytes(
+                    current_video, temp_output, jpg_bytes
+                )
+                results["operations"]["embed_thumbnail"] = embed_success
+                if embed_success:
+                    current_video = temp_output
+            else:
+                results["operations"]["embed_thumbnail"] = False
+
+        return current_video
+
+    async def _finalize_output(
+        self,
+        video_path: str,
+        current_video: str,
+        final_output_path: str,
+        overwrite: bool,
+        results: dict[str, Any],
+    ) -> None:
+        """Run the finalize stage: move/copy the processed file into place.
+
+        Args:
+            video_path: Path to the original input video file
+            current_video: Path to the latest processed file
+            final_output_path: Resolved output file path
+            overwrite: Whether the original file should be overwritten
+            results: Results dictionary being built by process_video
+        """
+        loop = asyncio.get_running_loop()
+        if current_video != video_path:
+            # Atomic rename out of the scratch dir; it lives on the
+            # destination filesystem by construction, so no bytes move
+            await loop.run_in_executor(None, os.replace, current_video, final_output_path)
+            results["output_path"] = final_output_path
+        elif not overwrite and final_output_path != video_path:
+            # No processing was done but user wants a copy
+            await loop.run_in_executor(None, _passthrough, video_path, final_output_path)
+            results["output_path"] = final_output_path
+        else:
+            # No processing and overwrite mode
+            results["output_path"] = video_path
+
+    async def process_videos(
+        self, video_paths: list[str], **options: Any
+    ) -> list[dict[str, Any]]:
+        """Process a batch of videos with bounded encode concurrency.
+
+        Dimension probing for the whole batch runs first with wide
+        concurrency (it is I/O-light and warms the probe cache); the
+        per-processor encode semaphore then caps how many of the fanned
+        out pipelines can hold an ffmpeg encode at once.
+
+        Args:
+            video_paths: Paths of the video files to process
+            **options: Keyword options forwarded to process_video
+
+        Returns:
+            One process_video result dict per input path, in order
+        """
+        await self.gather_dimensions(video_paths)
+
+        return list(
+            await asyncio.gather(
+                *(self.process_video(path, **options) for path in video_paths)
+            )
+        )
+
     async def process_video(
         self,
         video_path: str,
@@ -715,8 +2000,12 @@ class VideoProcessor:
         resize_width: int | None = None,
         resize_height: int | None = None,
         target_aspect_ratio: float | None = None,
+        stat_result: os.stat_result | None = None,
     ) -> dict[str, Any]:
         """Process video with all requested operations.
+
+        The work is organized in stages — probe/analyze, transform, and
+        finalize — so each stage can be awaited (and overlapped) on its own.
         
         Args:
             video_path: Path to the video file
@@ -728,7 +2017,9 @@ class VideoProcessor:
             resize_width: Optional target width for resizing
             resize_height: Optional target height for resizing
             target_aspect_ratio: Optional target aspect ratio (default: 16/9)
-            
+            stat_result: Optional os.stat result for the input file;
+                saves the probe stage its own stat call
+
         Returns:
             Dictionary with processing results
         """
@@ -738,19 +2029,13 @@ class VideoProcessor:
             "operations": {},
         }
 
-        # Validate video file exists
-        if not os.path.exists(video_path):
-            results["error"] = f"Video file not found: {video_path}"
-            return results
-
+        # No separate existence check: the probe's own stat is the
+        # authority and raises FileNotFoundError for a missing file
         try:
-            # Get initial video information
-            info = await self.get_video_dimensions(video_path)
-            results["original_dimensions"] = {
-                "width": info["width"],
-                "height": info["height"],
-                "aspect_ratio": info["aspect_ratio"],
-            }
+            # Get initial video information; the caller's stat result
+            # doubles as the probe-cache key
+            info = await self.get_video_dimensions(video_path, stat_result)
+            results["original_dimensions"] = info.as_dict()
 
             # Analyze if video needs processing
             analysis = await self.analyze_video_needs_processing(
@@ -776,124 +2061,51 @@ class VideoProcessor:
                 results["final_dimensions"] = results["original_dimensions"]
                 return results
 
-            # Determine output file path
-            if overwrite:
-                # When overwriting, we'll work with temp file and replace at the end
-                final_output_path = video_path
-            else:
-                # Determine the output path and name
-                video_dir = os.path.dirname(video_path)
-                video_basename = os.path.basename(video_path)
-                
-                if output_path:
-                    # Use specified output directory
-                    loop = asyncio.get_running_loop()
-                    await loop.run_in_executor(
-                        None, functools.partial(os.makedirs, output_path, exist_ok=True)
-                    )
-                    target_dir = output_path
-                else:
-                    # Use same directory as input
-                    target_dir = video_dir
-                
-                if output_name:
-                    # Use specified output name
-                    final_output_path = os.path.join(target_dir, output_name)
-                else:
-                    # Use same name as input
-                    final_output_path = os.path.join(target_dir, video_basename)
-            
-            # Working file starts as the input
-            current_video = video_path
-            temp_files = []
-            
-            # Step 1: Resize if requested (do this before aspect ratio normalization)
-            if resize_width or resize_height:
-                # Preserve original extension for ffmpeg format detection
-                base_path, ext = os.path.splitext(video_path)
-                temp_output = f"{base_path}.resize.tmp{ext}"
-                temp_files.append(temp_output)
-                resize_success = await self.resize_video(
-                    current_video, temp_output, resize_width, resize_height
-                )
-                results["operations"]["resize"] = resize_success
-                if resize_success:
-                    current_video = temp_output
-                else:
-                    _LOGGER.warning("Resize operation failed, continuing with other operations")
+            # Transform stage: resize, normalize, thumbnail
+            final_output_path = await self._resolve_output_path(
+                video_path, output_path, output_name, overwrite
+            )
 
-            # Step 2: Normalize aspect ratio
-            if normalize_aspect:
-                # Preserve original extension for ffmpeg format detection
-                base_path, ext = os.path.splitext(video_path)
-                temp_output = f"{base_path}.normalize.tmp{ext}"
-                temp_files.append(temp_output)
-                normalize_success = await self.normalize_aspect_ratio(
-                    current_video, temp_output, target_aspect_ratio
-                )
-                results["operations"]["normalize_aspect"] = normalize_success
-                if normalize_success:
-                    current_video = temp_output
-                else:
-                    _LOGGER.warning("Aspect ratio normalization failed, continuing with other operations")
+            # All intermediates go into one scratch directory on the
+            # destination filesystem, so finalize is an O(1) rename and
+            # cleanup is a single rmtree
+            loop = asyncio.get_running_loop()
+            scratch_dir = await loop.run_in_executor(
+                None,
+                functools.partial(
+                    tempfile.mkdtemp,
+                    prefix=".video_tools-",
+                    dir=os.path.dirname(final_output_path) or ".",
+                ),
+            )
+            self._scratch_dirs[video_path] = scratch_dir
 
-            # Step 3: Generate and embed thumbnail
-            if generate_thumbnail:
-                # Generate thumbnail in the same directory as the video
-                video_dir = os.path.dirname(video_path)
-                video_name = os.path.splitext(os.path.basename(video_path))[0]
-                thumbnail_path = os.path.join(video_dir, f"{video_name}_thumb.jpg")
-                temp_files.append(thumbnail_path)
-
-                thumbnail_success = await self.generate_thumbnail(
-                    current_video, thumbnail_path
-                )
-                results["operations"]["generate_thumbnail"] = thumbnail_success
-
-                if thumbnail_success:
-                    # Preserve original extension for ffmpeg format detection
-                    base_path, ext = os.path.splitext(video_path)
-                    temp_output = f"{base_path}.thumbnail.tmp{ext}"
-                    temp_files.append(temp_output)
-                    embed_success = await self.embed_thumbnail(
-                        current_video, temp_output, thumbnail_path
-                    )
-                    results["operations"]["embed_thumbnail"] = embed_success
-                    if embed_success:
-                        current_video = temp_output
-                else:
-                    results["operations"]["embed_thumbnail"] = False
+            current_video = await self._apply_operations(
+                video_path,
+                info,
+                results,
+                scratch_dir,
+                normalize_aspect,
+                generate_thumbnail,
+                resize_width,
+                resize_height,
+                target_aspect_ratio,
+            )
 
-            # Copy/move the final result to the output path
-            loop = asyncio.get_running_loop()
-            if current_video != video_path:
-                # We have a processed video
-                if overwrite:
-                    # Replace original (moves the file, so it no longer exists as temp)
-                    await loop.run_in_executor(None, os.replace, current_video, final_output_path)
-                else:
-                    # Copy to output path (temp file still exists and needs cleanup)
-                    await loop.run_in_executor(None, shutil.copy2, current_video, final_output_path)
-                    
-                results["output_path"] = final_output_path
-            elif not overwrite and final_output_path != video_path:
-                # No processing was done but user wants a copy
-                await loop.run_in_executor(None, shutil.copy2, video_path, final_output_path)
-                results["output_path"] = final_output_path
-            else:
-                # No processing and overwrite mode
-                results["output_path"] = video_path
+            # Finalize stage: move/copy the result to the output path
+            await self._finalize_output(
+                video_path, current_video, final_output_path, overwrite, results
+            )
 
-            # Store temp files list in results for cleanup after sensor state update
-            results["temp_files"] = temp_files
+            # The scratch dir is handed to the caller for cleanup after
+            # the sensor state update
+            results["temp_files"] = [scratch_dir]
 
-            # Get final video information
-            final_info = await self.get_video_dimensions(results["output_path"])
-            results["final_dimensions"] = {
-                "width": final_info["width"],
-                "height": final_info["height"],
-                "aspect_ratio": final_info["aspect_ratio"],
-            }
+            # Final dimensions come analytically from the transform
+            # stage; probe the output only if it didn't record them
+            if "final_dimensions" not in results:
+                final_info = await self.get_video_dimensions(results["output_path"])
+                results["final_dimensions"] = final_info.as_dict()
 
             # Success if at least one operation succeeded, or no operations were requested (simple copy)
             results["success"] = (
@@ -901,8 +2113,13 @@ class VideoProcessor:
                 else "output_path" in results
             )
 
+        except FileNotFoundError:
+            _LOGGER.error("Video file not found: %s", video_path)
+            results["error"] = f"Video file not found: {video_path}"
         except Exception as err:
             _LOGGER.error("Error processing video %s: %s", video_path, err)
             results["error"] = str(err)
+            # Don't leak intermediates when the pipeline blew up mid-way
+            await self.cleanup_temp_files_by_video_path(video_path)
 
         return results